@@ -28,11 +28,8 @@ from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from collections import Counter
 
-# Dependencias NLP
-try:
-    import spacy
-except ImportError:
-    spacy = None
+# Dependencias NLP (el modelo spaCy se obtiene del registro compartido de wordChef)
+from wordChef import registro_modelos
 
 try:
     import nltk
@@ -57,14 +54,12 @@ if nltk and stopwords:
 else:
     _stopwords_es = set()
 
-# Intentar cargar spaCy si está disponible
-_nlp = None
-if spacy:
-    try:
-        _nlp = spacy.load('es_core_news_sm')
-    except Exception:
-        # Si el modelo no está instalado, no fallamos; dejamos _nlp en None
-        _nlp = None
+# Intentar cargar spaCy si está disponible. El registro de wordChef comparte
+# el modelo con el resto del proceso, así que no se carga una segunda copia.
+# Si el modelo no está instalado, no fallamos; dejamos _nlp en None.
+# Se usa el registro directamente: `cargar_modelo_spacy` avisa por pantalla y
+# este módulo no debe imprimir nada al importarse.
+_nlp = registro_modelos.obtener(['es_core_news_sm'], respaldo_vacio=False)
 
 # ----------------------
 # SessionLogger (mejora 1)
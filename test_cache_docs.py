@@ -0,0 +1,101 @@
+"""
+Tests de la caché de documentos y la desactivación de componentes, con un `nlp` simulado (sin spaCy).
+"""
+from wordChef import (
+    cache_docs,
+    componentes_desactivados,
+    procesar_doc,
+    normalizador_texto,
+    extraer_entidades,
+    extraer_palabras_clave,
+    resumen_simple,
+)
+
+TEXTO = "Ana vive en Madrid y trabaja en Telefónica."
+
+
+# Token con los atributos que leen los analizadores
+class TokenFalso:
+    def __init__(self, texto, espacio):
+        self.text = texto
+        self.lower_ = texto.lower()
+        self.lemma_ = self.lower_
+        self.pos_ = "NOUN"
+        self.whitespace_ = espacio
+        self.is_space = False
+        self.is_alpha = texto.isalpha()
+
+
+# Doc de una sola oración que apunta los componentes que se le aplican
+class DocFalso(list):
+    def __init__(self, texto):
+        palabras = texto.split()
+        super().__init__(TokenFalso(p, " " if i < len(palabras) - 1 else "") for i, p in enumerate(palabras))
+        self.text = texto
+        self.ents = []
+        self.aplicados = []
+
+    @property
+    def sents(self):
+        return [self]
+
+    def has_annotation(self, atributo):
+        return atributo == "LEMMA" and "lemmatizer" in self.aplicados
+
+
+# Pipeline con los componentes de es_core_news_sm; cuenta las llamadas a nlp(texto)
+class NlpFalso:
+    pipe_names = ["tok2vec", "morphologizer", "parser", "attribute_ruler", "lemmatizer", "ner", "sentencizer"]
+
+    def __init__(self):
+        self.llamadas = []
+
+    def get_pipe(self, nombre):
+        def componente(doc):
+            doc.aplicados.append(nombre)
+            return doc
+        return componente
+
+    def __call__(self, texto, disable=()):
+        self.llamadas.append(tuple(disable))
+        doc = DocFalso(texto)
+        doc.aplicados.extend(c for c in self.pipe_names if c not in disable)
+        return doc
+
+
+def test_componentes_desactivados_por_tarea():
+    nlp = NlpFalso()
+    assert componentes_desactivados(nlp, None) == ()
+    assert set(componentes_desactivados(nlp, "entidades")) == set(nlp.pipe_names) - {"tok2vec", "ner"}
+    # Con sentencizer el resumen no necesita el parser
+    assert "parser" in componentes_desactivados(nlp, "resumen")
+
+
+def test_los_analizadores_comparten_un_doc():
+    nlp = NlpFalso()
+    cache_docs.limpiar()
+    normalizador_texto(TEXTO, nlp)
+    extraer_entidades(TEXTO, nlp)
+    extraer_palabras_clave(TEXTO, nlp)
+    resumen_simple(TEXTO, nlp=nlp)
+
+    assert len(nlp.llamadas) == 1
+    estadisticas = cache_docs.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"], estadisticas["docs"]) == (3, 1, 1)
+    # El NER y el sentencizer se añaden al Doc del normalizador; nada se repite y el parser nunca se ejecuta
+    doc = procesar_doc(TEXTO, nlp, "entidades")
+    assert doc.aplicados == ["tok2vec", "morphologizer", "attribute_ruler", "lemmatizer", "ner", "sentencizer"]
+    assert estadisticas["completados"] == 2
+
+
+def test_doc_completo_sirve_para_cualquier_tarea():
+    nlp, otro = NlpFalso(), NlpFalso()
+    cache_docs.limpiar()
+    doc = procesar_doc(TEXTO, nlp)
+    for tarea in ("normalizar", "resumen", "entidades", "palabras_clave"):
+        assert procesar_doc(TEXTO, nlp, tarea) is doc
+    assert doc.aplicados == nlp.pipe_names
+    assert cache_docs.estadisticas()["completados"] == 0
+    # Otro pipeline no reutiliza el Doc
+    assert procesar_doc(TEXTO, otro, "entidades") is not doc
+    assert len(nlp.llamadas) == len(otro.llamadas) == 1
@@ -0,0 +1,85 @@
+"""
+Presupuesto de tiempo de importación de wordChef.
+
+Importar wordChef no debe cargar spaCy, NLTK ni transformers: las
+herramientas que solo usan patrones regex tienen que arrancar rápido.
+"""
+import os
+import sys
+import json
+import subprocess
+
+# Margen generoso para máquinas lentas de CI; sin dependencias pesadas la importación tarda milisegundos
+PRESUPUESTO_SEGUNDOS = 0.5
+
+CODIGO = """
+import json, sys, time
+inicio = time.perf_counter()
+import wordChef
+duracion = time.perf_counter() - inicio
+pesados = [m for m in ("spacy", "nltk", "transformers", "torch") if m in sys.modules]
+wordChef.encontrar_correos("escribe a juan@ejemplo.com")
+sys.stderr.write(json.dumps({"duracion": duracion, "pesados": pesados}))
+"""
+
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# Usa el logger tras configurarlo (o no) y lista lo que se ha creado en la carpeta de trabajo
+CODIGO_LOGGER = """
+import json, os, sys
+import wordChef
+creado_al_importar = os.listdir(".")
+if len(sys.argv) > 1:
+    wordChef.configurar_logger(sys.argv[1])
+wordChef.logger.registrar_patron("Correos", ["juan@ejemplo.com"])
+sys.stderr.write(json.dumps({"al_importar": creado_al_importar, "al_usar": os.listdir("."),
+                             "logger": type(wordChef.logger).__name__}))
+"""
+
+
+def _importar_en_subproceso():
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO],
+        cwd=RAIZ,
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stderr.strip().splitlines()[-1])
+
+
+def _usar_logger_en_subproceso(carpeta, *args, entorno=None):
+    env = dict(os.environ, PYTHONPATH=RAIZ)
+    env.pop("WORDCHEF_LOG", None)
+    env.update(entorno or {})
+    salida = subprocess.run(
+        [sys.executable, "-c", CODIGO_LOGGER, *args],
+        cwd=carpeta, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(salida.stderr.strip().splitlines()[-1])
+
+
+def test_importar_no_carga_dependencias_pesadas():
+    assert _importar_en_subproceso()["pesados"] == []
+
+
+def test_importar_dentro_del_presupuesto():
+    assert _importar_en_subproceso()["duracion"] < PRESUPUESTO_SEGUNDOS
+
+
+def test_importar_no_crea_carpeta_de_logs(tmp_path):
+    resultado = _usar_logger_en_subproceso(str(tmp_path))
+    assert resultado["al_importar"] == []
+    assert resultado["al_usar"] == ["logs"]
+
+
+def test_logger_nulo_no_escribe_nada(tmp_path):
+    resultado = _usar_logger_en_subproceso(str(tmp_path), "nulo")
+    assert resultado["logger"] == "LoggerNulo"
+    assert resultado["al_usar"] == []
+
+
+def test_alias_de_wordchef_log(tmp_path):
+    for valor in ("null", "disabled", "NULO"):
+        resultado = _usar_logger_en_subproceso(str(tmp_path), entorno={"WORDCHEF_LOG": valor})
+        assert resultado["logger"] == "LoggerNulo"
+        assert resultado["al_usar"] == []
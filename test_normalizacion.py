@@ -0,0 +1,156 @@
+"""
+Tests del normalizador de texto de wordChef.
+"""
+import os
+
+import pytest
+
+from wordChef import (
+    normalizador_texto,
+    _normalizar,
+    corregir_palabras,
+    cargar_modelo_spacy,
+    MotorCorrecciones,
+    CorrectorDifuso,
+    configurar_corrector_difuso,
+    cache_lemas,
+    configurar_lemas,
+)
+from wordChef_lemas import TablaLemas, compilar_tsv, compilar_tabla
+from wordChef_bench import _normalizar_referencia
+
+LEXICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lexico_ejemplo.txt")
+LEMAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lemas_ejemplo.tsv")
+TEXTO = "Hola hola HOLA, mundo.  La casa casa\nhaiga gente gente enserio."
+
+
+def test_sin_repeticiones_sin_spacy():
+    resultado = normalizador_texto(TEXTO, None)
+    assert resultado["sin_repeticiones"] == "Hola HOLA, mundo. La casa haiga gente enserio."
+    assert resultado["lematizado"] == "(spaCy requerido)"
+
+
+def test_una_pasada_igual_que_la_version_anterior():
+    pytest.importorskip("spacy")
+    nlp = cargar_modelo_spacy()
+    doc = nlp(TEXTO)
+    resultado = _normalizar(TEXTO, doc)
+    assert resultado.pop("corregido_difuso") is None
+    assert resultado == _normalizar_referencia(TEXTO, doc)
+
+
+def test_motor_correcciones_varias_palabras():
+    motor = MotorCorrecciones({"a el": "al", "de el": "del", "en": "EN", "haiga": "haya"})
+    palabras = "Voy a el cine de el barrio en casa si haiga sitio".split()
+    assert motor.corregir(palabras) == ["Voy", "al", "cine", "del", "barrio", "EN", "casa", "si", "haya", "sitio"]
+
+
+def test_correccion_por_tokens_vuelve_atras():
+    # "a b c" no llega a completarse: se aplica "a b" y se sigue desde "c"
+    motor = MotorCorrecciones({"a b": "AB", "a b c d": "ABCD", "c x": "CX"})
+    correccion = motor.nueva_correccion()
+    for palabra in "a b c x a b c".split():
+        correccion.agregar(palabra)
+    assert correccion.terminar() == ["AB", "CX", "AB", "c"]
+    repetidas = motor.nueva_correccion(sin_repeticiones=True)
+    for palabra in "c C a b b B".split():
+        repetidas.agregar(palabra)
+    assert repetidas.terminar() == ["c", "AB"]
+
+
+def test_motor_correcciones_recarga_en_caliente(tmp_path):
+    ruta = tmp_path / "correcciones.tsv"
+    ruta.write_text("# comentario\nnaiden\tnadie\n", encoding="utf-8")
+    motor = MotorCorrecciones(rutas=[str(ruta)], intervalo_recarga=0)
+    assert motor.corregir(["naiden", "vino"]) == ["nadie", "vino"]
+
+    ruta.write_text("naiden\tnadie\nen serio\tde verdad\n", encoding="utf-8")
+    mtime = os.stat(ruta).st_mtime_ns + 10**9
+    os.utime(ruta, ns=(mtime, mtime))
+    assert motor.comprobar_cambios()
+    assert motor.corregir(["En", "serio"]) == ["de verdad"]
+
+
+def test_corrector_difuso():
+    corrector = CorrectorDifuso()
+    corrector.cargar_lexico(LEXICO)
+    assert corrector.corregir_texto("El clinte dise que la aplicasion no va desde aier, FACTRUA 123") == \
+        "El cliente dice que la aplicación no va desde ayer, FACTURA 123"
+    # A igual distancia gana la más frecuente; sin candidatos cercanos no se cambia
+    corrector.agregar("cosa", 10)
+    corrector.agregar("casa", 1000)
+    assert corrector.sugerencia("cesa") == "casa"
+    assert corrector.corregir_palabra("xyzwq") == "xyzwq"
+
+
+def test_corregido_difuso_en_el_normalizador():
+    assert normalizador_texto("hola mundo", None)["corregido_difuso"] is None
+    configurar_corrector_difuso(LEXICO)
+    try:
+        assert normalizador_texto("El clinte dise", None)["corregido_difuso"] == "El cliente dice"
+    finally:
+        configurar_corrector_difuso(None)
+
+
+def test_modo_rapido_con_cache_de_lemas():
+    pytest.importorskip("spacy")
+    nlp = cargar_modelo_spacy(respaldo_vacio=False)
+    if nlp is None or "lemmatizer" not in nlp.pipe_names:
+        pytest.skip("hace falta un modelo de spaCy con lematizador")
+    cache_lemas.limpiar()
+    # Sin modo rápido la caché ni se consulta ni se llena
+    normalizador_texto("Procesamos los textos y procesamos los datos.", nlp)
+    assert cache_lemas.estadisticas()["entradas"] == 0
+    completo = normalizador_texto("Procesamos los textos y procesamos los datos.", nlp, rapido=True)
+    # Los fallos se cuentan por token: las 8 formas del texto, aún sin caché
+    assert cache_lemas.estadisticas()["fallos"] == 8
+    # Mismo vocabulario (con las mismas mayúsculas) en otro orden: todas las formas están en la caché
+    rapido = normalizador_texto("los datos y los textos procesamos.", nlp, rapido=True)
+    estadisticas = cache_lemas.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (7, 8)
+    assert rapido["lematizado"].split()[-2] == completo["lematizado"].split()[0]
+    # "Los" no se ha visto con mayúscula: un fallo, el resto aciertos
+    normalizador_texto("Los datos.", nlp, rapido=True)
+    estadisticas = cache_lemas.estadisticas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (9, 9)
+
+
+def test_tabla_de_lemas(tmp_path):
+    ruta = str(tmp_path / "lemas.bin")
+    assert compilar_tabla([("Casas", "casa"), ("fue", "ser"), ("fui", "ser"), ("año", "año")], ruta) == 4
+    with TablaLemas(ruta) as tabla:
+        assert len(tabla) == 4
+        assert tabla.buscar("CASAS") == "casa"
+        assert tabla.buscar("fui") == "ser"
+        assert tabla.buscar("año") == "año"
+        assert tabla.buscar("casa") is None
+        assert tabla.lema("Perros") == "perros"
+
+
+def test_normalizador_sin_spacy_con_tabla_de_lemas(tmp_path):
+    ruta = str(tmp_path / "lemas.bin")
+    compilar_tsv(LEMAS, ruta)
+    configurar_lemas(ruta)
+    try:
+        resultado = normalizador_texto("Procesamos las facturas, haiga o no haiga problemas.", None)
+    finally:
+        configurar_lemas(None)
+    assert resultado["lematizado"] == "procesar el factura , haiga o no haiga problema ."
+    assert resultado["corregido"] == "Procesamos las facturas , haya o no haya problemas ."
+
+
+def test_correccion_igual_con_y_sin_spacy(tmp_path):
+    pytest.importorskip("spacy")
+    nlp = cargar_modelo_spacy()
+    texto = "Voy al cine cine, haiga o no haiga sitio enserio."
+    doc = nlp(texto)
+    esperado = corregir_palabras(doc)
+    assert esperado == "Voy al cine , haya o no haya sitio en serio ."
+    assert _normalizar(texto, doc)["corregido"] == esperado
+    ruta = str(tmp_path / "lemas.bin")
+    compilar_tsv(LEMAS, ruta)
+    configurar_lemas(ruta)
+    try:
+        assert normalizador_texto(texto, None)["corregido"] == esperado
+    finally:
+        configurar_lemas(None)
@@ -0,0 +1,42 @@
+"""
+Tests del barrido de directorios de wordChef_paralelo (sin spaCy: solo patrones).
+"""
+from wordChef_paralelo import AgregadosPatrones, barrer_directorio, procesar_corpus
+
+
+def test_barrido_con_agregados(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("Pagué 1.500€ el 15/03/2024. Escribe a juan@ejemplo.com", encoding="utf-8")
+    (tmp_path / "sub" / "b.txt").write_text("Cobro de 30,5 euros el 2024-03-20 para JUAN@ejemplo.com", encoding="utf-8")
+    (tmp_path / "c.csv").write_text("ignorado 99€ ana@correo.es", encoding="utf-8")
+
+    agregados = AgregadosPatrones()
+    resultados = list(barrer_directorio(str(tmp_path), n_process=1, agregados=agregados))
+
+    assert sorted(r["archivo"] for r in resultados) == [str(tmp_path / "a.txt"), str(tmp_path / "sub" / "b.txt")]
+    resumen = agregados.como_dict()
+    assert resumen["correos"] == ["juan@ejemplo.com"]
+    assert resumen["totales"] == {"EUR": "1530.5"}
+    assert resumen["histograma_fechas"] == {"2024-03": 2}
+
+
+def test_procesar_corpus_en_varios_procesos_ordenado_y_desordenado():
+    textos = [f"Pago {i},50€ el {1 + i % 28:02d}/03/2024 a usuario{i}@ejemplo.com" if i % 3 else "" for i in range(60)]
+    esperado = list(procesar_corpus(textos, "patrones", n_process=1, tam_fragmento=7))
+    ordenado = list(procesar_corpus(textos, "patrones", n_process=2, tam_fragmento=7))
+    desordenado = list(procesar_corpus(textos, "patrones", n_process=2, tam_fragmento=7, ordenado=False))
+    assert [i for i, _ in ordenado] == list(range(len(textos)))
+    assert ordenado == esperado
+    assert sorted(desordenado, key=lambda par: par[0]) == ordenado
+    assert ordenado[1][1]["correos"] == ["usuario1@ejemplo.com"]
+
+
+def test_limite_de_tiempo_en_los_trabajadores(tmp_path):
+    (tmp_path / "a.txt").write_text("Pagué 1.500€ a juan@ejemplo.com", encoding="utf-8")
+    agregados = AgregadosPatrones()
+    resultados = list(barrer_directorio(str(tmp_path), n_process=1, agregados=agregados, limite_segundos=0))
+    assert "error" in resultados[0] and agregados.errores == 1
+    (_, resultado), = procesar_corpus(["Pagué 1.500€"], "patrones", n_process=1, limite_patrones=0)
+    assert "error" in resultado
+    (_, resultado), = procesar_corpus(["Pagué 1.500€"], "patrones", n_process=1)
+    assert "error" not in resultado and resultado["dinero"] == [" 1.500€"]
@@ -0,0 +1,191 @@
+"""
+Tests de la búsqueda de patrones (fechas, dinero y correos) de wordChef.
+"""
+import io
+import json
+import time
+from decimal import Decimal
+
+import pytest
+
+from wordChef import (
+    encontrar_fechas,
+    encontrar_dinero,
+    encontrar_correos,
+    encontrar_patrones,
+    encontrar_patrones_flujo,
+    registrar_tipo_patron,
+    eliminar_tipo_patron,
+    cargar_patrones,
+    EscanerIncremental,
+    parsear_dinero,
+    parsear_fecha,
+    columnas_patrones,
+    anonimizar,
+    anonimizar_flujo,
+    analizar_todo,
+    _buscar_patrones,
+)
+
+TEXTO = "Nací el 15/03/1995 y mi email es juan@ejemplo.com. Gané 1.500€ el 2024-01-05 y pagué 30 euros."
+
+
+def test_una_pasada_coincide_con_las_funciones_separadas():
+    coincidencias = encontrar_patrones(TEXTO)
+    assert [c.texto for c in coincidencias if c.tipo == "fechas"] == encontrar_fechas(TEXTO)
+    assert [c.texto for c in coincidencias if c.tipo == "dinero"] == encontrar_dinero(TEXTO)
+    assert [c.texto for c in coincidencias if c.tipo == "correos"] == encontrar_correos(TEXTO)
+
+
+def test_offsets_apuntan_al_texto():
+    for c in encontrar_patrones(TEXTO):
+        assert TEXTO[c.inicio:c.fin] == c.texto
+
+
+def test_filtrar_por_tipos():
+    assert [c.tipo for c in encontrar_patrones(TEXTO, tipos=["correos"])] == ["correos"]
+    assert encontrar_patrones(TEXTO, tipos=[]) == []
+
+
+def test_flujo_por_bloques_igual_que_texto_completo():
+    texto = (TEXTO + " ") * 200
+    esperado = encontrar_patrones(texto)
+    for tam_bloque in (5, 64, 1000):
+        assert list(encontrar_patrones_flujo(io.StringIO(texto), tam_bloque=tam_bloque, solape=128)) == esperado
+
+
+def test_entradas_adversariales_en_tiempo_lineal():
+    # Con los patrones originales estas entradas tardaban minutos (coste cuadrático).
+    # Cada una lleva el carácter que exige su prefiltro para que el regex sí se ejecute.
+    for texto in ("5€ 1" + ",234" * 50000, "@ " + "a." * 100000, "a@" + "b." * 100000 + "1"):
+        inicio = time.perf_counter()
+        encontrar_dinero(texto)
+        encontrar_correos(texto)
+        encontrar_patrones(texto)
+        assert time.perf_counter() - inicio < 2
+
+
+def test_correo_con_acentos_no_se_parte():
+    # El lookbehind debe cubrir cualquier letra, no solo ASCII: "maría@..." no es "a@..."
+    texto = "maría@correo.es, josé.garcía@empresa.es, Peña-lópez@x.com y ana@correo.es"
+    assert encontrar_correos(texto) == ["ana@correo.es"]
+    assert [c.texto for c in encontrar_patrones(texto)] == ["ana@correo.es"]
+    assert anonimizar(texto) == "maría@correo.es, josé.garcía@empresa.es, Peña-lópez@x.com y [CORREO]"
+    for texto in ("@ " + "á." * 100000, "@ " + "ñ" * 200000):
+        inicio = time.perf_counter()
+        encontrar_correos(texto)
+        assert time.perf_counter() - inicio < 2
+
+
+def test_correo_sin_signos_de_delante():
+    # Como el \b original: los signos . % + - que preceden a la dirección no forman parte de ella
+    for texto, inicio in (("contacto: .juan@x.com", 11), ("(+juan@x.com)", 2), ("...a@b.com", 3)):
+        correo = texto[inicio:].rstrip(")")
+        assert encontrar_correos(texto) == [correo]
+        assert encontrar_patrones(texto) == [("correos", correo, inicio, inicio + len(correo))]
+        assert list(encontrar_patrones_flujo(io.StringIO(texto), tam_bloque=4, solape=32)) == encontrar_patrones(texto)
+        assert anonimizar(texto) == texto[:inicio] + "[CORREO]" + texto[inicio + len(correo):]
+    assert encontrar_correos(" .-@b.com") == []
+    inicio = time.perf_counter()
+    encontrar_correos("@ " + ".+" * 100000 + "a")
+    assert time.perf_counter() - inicio < 2
+
+
+def test_limite_de_tiempo():
+    with pytest.raises(TimeoutError):
+        encontrar_patrones("pago 10€ a juan@ejemplo.com " * 100000, limite_segundos=0)
+    # Un texto corto (un solo bloque) también se comprueba
+    with pytest.raises(TimeoutError):
+        encontrar_patrones(TEXTO, limite_segundos=0)
+    assert encontrar_patrones(TEXTO, limite_segundos=10) == encontrar_patrones(TEXTO)
+    assert "error" in _buscar_patrones(TEXTO, limite_segundos=0)
+    assert analizar_todo(TEXTO, limite_patrones=10)["patrones"] == _buscar_patrones(TEXTO)
+
+
+def test_patron_registrado_en_la_misma_pasada():
+    registrar_tipo_patron("dni", r"\b\d{8}-?[A-HJ-NP-TV-Z]\b")
+    try:
+        coincidencias = encontrar_patrones("DNI 12345678Z, contacto juan@ejemplo.com")
+        assert [(c.tipo, c.texto) for c in coincidencias] == [("dni", "12345678Z"), ("correos", "juan@ejemplo.com")]
+    finally:
+        eliminar_tipo_patron("dni")
+    assert [c.tipo for c in encontrar_patrones("DNI 12345678Z")] == []
+
+
+def test_patron_registrado_con_grupo_con_nombre_falla():
+    with pytest.raises(ValueError):
+        registrar_tipo_patron("malo", r"(?P<x>\d+)")
+
+
+def test_cargar_patrones_desde_json(tmp_path):
+    ruta = tmp_path / "patrones.json"
+    ruta.write_text(json.dumps({"url": {"patron": r"\bhttps?://[^\s<>\"]+", "prefiltro": ["http"]}}), encoding="utf-8")
+    assert cargar_patrones(str(ruta)) == ["url"]
+    try:
+        assert [c.texto for c in encontrar_patrones("ver https://ejemplo.com hoy")] == ["https://ejemplo.com"]
+    finally:
+        eliminar_tipo_patron("url")
+
+
+def test_escaner_incremental_solo_reescanea_lo_editado():
+    lineas = [f"Linea {i}: {TEXTO}" for i in range(300)]
+    escaner = EscanerIncremental()
+    assert escaner.escanear("\n".join(lineas)) == encontrar_patrones("\n".join(lineas))
+    lineas[150] = "Nuevo correo: ana@correo.es el 01/02/2025"
+    editado = "\n".join(lineas)
+    assert escaner.escanear(editado) == encontrar_patrones(editado)
+    assert escaner.reescaneados < escaner.reutilizados
+
+
+def test_parsear_dinero():
+    assert parsear_dinero("1.500€") == (Decimal("1500"), "EUR")
+    assert parsear_dinero("1.500,25 €") == (Decimal("1500.25"), "EUR")
+    assert parsear_dinero("30,5 euros") == (Decimal("30.5"), "EUR")
+    assert parsear_dinero("$1,234.50") == (Decimal("1234.50"), "USD")
+    # Con parte entera 0 el separador solo puede ser decimal
+    assert parsear_dinero("0,999 €") == (Decimal("0.999"), "EUR")
+    assert parsear_dinero("0.500€") == (Decimal("0.500"), "EUR")
+
+
+def test_parsear_fecha():
+    assert parsear_fecha("15/03/1995") == "1995-03-15"
+    assert parsear_fecha("2024-01-05") == "2024-01-05"
+    assert parsear_fecha("1/2/99") == "1999-02-01"
+    assert parsear_fecha("31/02/2024") is None
+
+
+def test_columnas_patrones():
+    columnas = columnas_patrones([TEXTO, "sin patrones", "Cobro de 12 USD el 31/02/2024 y 2024-01-20"])
+    assert list(columnas.dinero_documento) == [0, 0, 2]
+    assert list(columnas.centimos) == [150000, 3000, 1200]
+    assert columnas.total_por_moneda() == {"EUR": Decimal("1530.00"), "USD": Decimal("12.00")}
+    assert list(columnas.fechas_documento) == [0, 0, 2]
+    assert columnas.histograma_fechas() == {"1995-03": 1, "2024-01": 2}
+    assert columnas.no_interpretados["fechas"] == 1
+
+
+def test_columnas_patrones_importe_fuera_de_rango():
+    texto = "Debe 1.000.000.000.000.000.000.000 € y 12 €"
+    assert len(encontrar_dinero(texto)) == 2
+    columnas = columnas_patrones([texto])
+    assert list(columnas.centimos) == [1200]
+    assert columnas.no_interpretados["dinero"] == 1
+
+
+def test_anonimizar_mascara():
+    assert anonimizar(TEXTO) == "Nací el [FECHA] y mi email es [CORREO]. Gané [DINERO] el [FECHA] y pagué [DINERO]."
+
+
+def test_anonimizar_hash_estable_y_con_clave():
+    a = anonimizar("juan@ejemplo.com y juan@ejemplo.com", modo="hash", clave=b"secreto")
+    primero, segundo = a.split(" y ")
+    assert primero == segundo and primero.startswith("[CORREO:")
+    assert anonimizar("juan@ejemplo.com", modo="hash") != primero
+
+
+def test_anonimizar_flujo_igual_que_texto_completo():
+    texto = (TEXTO + "\n") * 500
+    salida = io.StringIO()
+    sustituciones = anonimizar_flujo(io.StringIO(texto), salida, tam_bloque=500, solape=100)
+    assert salida.getvalue() == anonimizar(texto)
+    assert sustituciones == {"fechas": 1000, "dinero": 1000, "correos": 500}
@@ -0,0 +1,67 @@
+"""
+Tests del análisis de sentimiento por lotes con un clasificador simulado (sin transformers).
+"""
+import pytest
+
+from wordChef import AgrupadorSentimiento, sentimiento_es, sentimiento_es_lote
+
+
+# Clasificador falso: devuelve "4 stars" salvo para los textos que contienen "mal"
+class ClasificadorFalso:
+    def __call__(self, textos, **kwargs):
+        if isinstance(textos, str):
+            textos = [textos]
+        return [{"label": "1 star" if "mal" in t else "4 stars", "score": 0.9} for t in textos]
+
+
+def test_agrupador_sobrevive_a_un_lote_que_falla():
+    class Roto(ClasificadorFalso):
+        def __call__(self, textos, **kwargs):
+            if any("roto" in t for t in textos):
+                return ["sin formato"] * len(textos)
+            return super().__call__(textos, **kwargs)
+
+    with AgrupadorSentimiento(Roto(), espera_ms=0) as agrupador:
+        fallido = agrupador.enviar("texto roto")
+        with pytest.raises(AttributeError):
+            fallido.result(timeout=5)
+        assert agrupador.enviar("qué bien").result(timeout=5)[0] == "Positivo"
+
+
+def test_agrupador_cerrado_no_admite_peticiones():
+    agrupador = AgrupadorSentimiento(ClasificadorFalso())
+    assert agrupador.enviar("lo hizo mal").result(timeout=5)[0] == "Negativo"
+    agrupador.cerrar()
+    with pytest.raises(RuntimeError):
+        agrupador.enviar("otra")
+
+
+def test_tokenizer_que_falla_solo_afecta_a_su_texto():
+    class Tokenizer:
+        is_fast = True
+
+        def __call__(self, texto, **kwargs):
+            raise ValueError("tokenizer roto")
+
+    clasificador = ClasificadorFalso()
+    clasificador.tokenizer = Tokenizer()
+    largo = "palabra " * 200
+    esperado = sentimiento_es(largo, clasificador)
+    assert esperado == ("Error", 0.0, "tokenizer roto")
+    resultados = list(sentimiento_es_lote(["muy bien", largo, "fatal, mal"], clasificador))
+    assert [r[0] for r in resultados] == ["Positivo", "Error", "Negativo"]
+    assert resultados[1] == esperado
+    with AgrupadorSentimiento(clasificador) as agrupador:
+        assert agrupador.enviar(largo).result(timeout=5) == esperado
+        assert agrupador.enviar("muy bien").result(timeout=5)[0] == "Positivo"
+
+
+def test_texto_corto_se_clasifica_con_truncado():
+    class Registro(ClasificadorFalso):
+        def __call__(self, textos, **kwargs):
+            self.kwargs = kwargs
+            return super().__call__(textos, **kwargs)
+
+    clasificador = Registro()
+    assert sentimiento_es("muy bien", clasificador)[0] == "Positivo"
+    assert clasificador.kwargs.get("truncation") is True
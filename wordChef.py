@@ -13,32 +13,52 @@ Unifica utilidades de procesamiento de texto con:
 import re
 import sys
 import os
-from collections import Counter
-from datetime import datetime
+import io
+import json
+import hashlib
+import importlib
+import time
+import threading
+import itertools
+import queue
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from typing import NamedTuple
 
 
 # ----------------------
-# Intentos de import
+# Imports perezosos
 # ----------------------
-# Trata de importar spaCy; si no está, asigna None para manejo posterior
-try:
-    import spacy
-except ImportError:
-    spacy = None
+# spaCy, NLTK y transformers tardan segundos en importarse, así que no se
+# importan al cargar wordChef sino la primera vez que un analizador los pide.
+# Así las funciones de patrones (solo `re`) arrancan en milisegundos.
+_modulos_opcionales = {}
 
-# Trata de importar nltk y módulos necesarios; si no está, asigna None
-try:
-    import nltk
-    from nltk.corpus import stopwords
-    from nltk.tokenize import word_tokenize
-except ImportError:
-    nltk = None
 
-# Trata de importar pipeline desde transformers; si no está, asigna None
-try:
-    from transformers import pipeline
-except ImportError:
-    pipeline = None
+# Importa un módulo opcional una sola vez; devuelve None si no está instalado
+def _importar(nombre):
+    if nombre not in _modulos_opcionales:
+        try:
+            _modulos_opcionales[nombre] = importlib.import_module(nombre)
+        except ImportError:
+            _modulos_opcionales[nombre] = None
+    return _modulos_opcionales[nombre]
+
+
+# Compatibilidad: `wordChef.spacy`, `wordChef.nltk`, `wordChef.pipeline` y `wordChef.logger` siguen existiendo, pero se resuelven al usarlos
+def __getattr__(nombre):
+    if nombre in ("spacy", "nltk"):
+        return _importar(nombre)
+    if nombre == "pipeline":
+        transformers = _importar("transformers")
+        return transformers.pipeline if transformers is not None else None
+    if nombre == "logger":
+        return obtener_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
 
 # ----------------------
@@ -60,12 +80,12 @@ class SessionLogger:
     seguimiento de sesiones interactivas desde el CLI.
     """
     # Constructor crea carpeta logs si no existe y crea fichero log con timestamp
-    def __init__(self):
-        if not os.path.exists("logs"):
-            os.makedirs("logs")
-            print("📁 Carpeta 'logs' creada automáticamente.")
+    def __init__(self, carpeta="logs"):
+        if not os.path.exists(carpeta):
+            os.makedirs(carpeta)
+            print(f"📁 Carpeta '{carpeta}' creada automáticamente.")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.filename = f"logs/session_{timestamp}.log"
+        self.filename = os.path.join(carpeta, f"session_{timestamp}.log")
         self._write_header()
 
     # Escribe cabecera inicial del log con formato y fecha
@@ -94,9 +114,91 @@ class SessionLogger:
                 f.write(f"Resultado: {resultado}\n")
             f.write("\n" + "="*80 + "\n\n")
 
+    # Añade entrada de log con las coincidencias de una búsqueda por patrón
+    def registrar_patron(self, tipo_patron: str, coincidencias):
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.write(f"[{datetime.now().strftime('%H:%M:%S')}] Patrón: {tipo_patron}\n")
+            f.write("-"*80 + "\n")
+            f.write(f"Coincidencias: {len(coincidencias)}\n")
+            for item in coincidencias:
+                f.write(f"    • {item}\n")
+            f.write("\n" + "="*80 + "\n\n")
+
+
+class LoggerNulo:
+    """
+    Logger que descarta todas las entradas.
+
+    Tiene la misma API que `SessionLogger` pero no crea carpetas ni
+    archivos. Es el destino adecuado para procesos trabajadores, tests y
+    uso de wordChef como librería.
+    """
+    filename = None
+
+    def log(self, tipo: str, entrada: str, resultado):
+        pass
+
+    def registrar_patron(self, tipo_patron: str, coincidencias):
+        pass
+
+
+# El logger se crea la primera vez que se usa, no al importar el módulo.
+# El destino por defecto se puede fijar con la variable de entorno WORDCHEF_LOG ("archivo" o "nulo").
+DESTINOS_LOG = ("archivo", "nulo")
+# Otros nombres aceptados para cada destino, en WORDCHEF_LOG y en configurar_logger
+ALIAS_DESTINOS_LOG = {"file": "archivo", "null": "nulo", "none": "nulo", "disabled": "nulo", "off": "nulo", "0": "nulo"}
+_config_logger = {"destino": os.environ.get("WORDCHEF_LOG", "archivo"), "carpeta": "logs"}
+_logger = None
+
+
+# Nombre canónico de un destino de log ("archivo" o "nulo"), o None si no se reconoce
+def _destino_log(valor):
+    valor = valor.strip().lower()
+    return valor if valor in DESTINOS_LOG else ALIAS_DESTINOS_LOG.get(valor)
+
+
+# Cambia el destino del logger de sesión; el nuevo logger se crea en el próximo uso
+def configurar_logger(destino="archivo", carpeta="logs"):
+    """
+    Configura el logger de sesión.
 
-logger = SessionLogger()
-print(f"📝 Sesión iniciada. Logs guardados en: {logger.filename}\n")
+    Args:
+        destino (str): "archivo" para escribir en `carpeta/session_*.log`
+            o "nulo" para descartar los registros (también se aceptan los
+            alias de `ALIAS_DESTINOS_LOG`, como "null" o "disabled").
+        carpeta (str): Carpeta de los logs cuando el destino es "archivo".
+    """
+    global _logger
+    canonico = _destino_log(destino)
+    if canonico is None:
+        raise ValueError(f"Destino de log desconocido: {destino!r}. Opciones: {', '.join(DESTINOS_LOG)}")
+    _config_logger.update(destino=canonico, carpeta=carpeta)
+    _logger = None
+
+
+# Devuelve el logger de sesión, creándolo la primera vez
+def obtener_logger():
+    """
+    Devuelve el logger de sesión configurado, creándolo en el primer uso.
+
+    Returns:
+        SessionLogger | LoggerNulo: Logger compartido por el proceso.
+    """
+    global _logger
+    if _logger is None:
+        destino = _destino_log(_config_logger["destino"])
+        if destino is None:
+            # Solo llega aquí un WORDCHEF_LOG mal escrito: se avisa en lugar de ignorarlo en silencio
+            print(f"Aviso: WORDCHEF_LOG={_config_logger['destino']!r} no es un destino de log válido "
+                  f"(opciones: {', '.join(DESTINOS_LOG + tuple(ALIAS_DESTINOS_LOG))}); se usa 'archivo'.",
+                  file=sys.stderr)
+            destino = _config_logger["destino"] = "archivo"
+        if destino == "nulo":
+            _logger = LoggerNulo()
+        else:
+            _logger = SessionLogger(_config_logger["carpeta"])
+            print(f"📝 Sesión iniciada. Logs guardados en: {_logger.filename}\n")
+    return _logger
 
 
 # ----------------------
@@ -118,7 +220,104 @@ def leer_archivo(ruta: str) -> str | None:
 # Inicialización de dependencias
 # ----------------------
 
-def cargar_modelo_spacy():
+# Modelos de spaCy que se prueban por defecto, en orden
+MODELOS_SPACY = ("es_core_news_sm", "es_core_news_md", "xx_sent_ud_sm")
+
+
+# Memoria residente del proceso en MB (None si la plataforma no la expone)
+def _memoria_rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        return None
+
+
+class RegistroModelos:
+    """
+    Registro de modelos spaCy compartido por todo el proceso.
+
+    Cada modelo se carga una sola vez con `spacy.load` y se reutiliza en
+    todas las llamadas posteriores, también desde otros módulos
+    (p. ej. `bloque_mejoras_MariusDanieBaroana.py`). Los nombres que fallan
+    se recuerdan para no reintentar la carga en cada llamada.
+
+    Métodos principales:
+    - obtener(modelos, respaldo_vacio): devuelve el primer modelo disponible
+      de la cadena `modelos`.
+    - info(): tiempo de carga y memoria aproximada de cada modelo cargado.
+    """
+    # Constructor con diccionarios vacíos; el lock evita cargas dobles desde varios hilos
+    def __init__(self):
+        self._modelos = {}
+        self._info = {}
+        self._fallidos = set()
+        self._lock = threading.Lock()
+
+    # Carga un modelo midiendo tiempo y memoria; añade sentencizer si falta
+    def _cargar(self, nombre, spacy):
+        memoria_antes = _memoria_rss_mb()
+        inicio = time.perf_counter()
+        nlp = spacy.blank("es") if nombre == "blank:es" else spacy.load(nombre)
+        if "sentencizer" not in nlp.pipe_names:
+            try:
+                nlp.add_pipe("sentencizer")
+            except Exception:
+                pass
+        memoria_despues = _memoria_rss_mb()
+        self._modelos[nombre] = nlp
+        self._info[nombre] = {
+            "segundos_carga": time.perf_counter() - inicio,
+            "memoria_mb": memoria_despues - memoria_antes if memoria_antes is not None else None,
+            "componentes": list(nlp.pipe_names),
+        }
+        return nlp
+
+    # Devuelve el primer modelo de la cadena que esté (o pueda ser) cargado
+    def obtener(self, modelos=MODELOS_SPACY, respaldo_vacio=True):
+        """
+        Devuelve un modelo spaCy cargado, reutilizándolo si ya existe.
+
+        Args:
+            modelos (Iterable[str]): Cadena de nombres de modelo a probar en orden.
+            respaldo_vacio (bool): Si ninguno carga, devolver `spacy.blank("es")`
+                con `sentencizer` en lugar de `None`.
+
+        Returns:
+            Language | None: Modelo compartido, o `None` si spaCy no está
+            instalado o no hay modelo y `respaldo_vacio` es `False`.
+        """
+        spacy = _importar("spacy")
+        if spacy is None:
+            return None
+        with self._lock:
+            for nombre in modelos:
+                if nombre in self._modelos:
+                    return self._modelos[nombre]
+                if nombre in self._fallidos:
+                    continue
+                try:
+                    return self._cargar(nombre, spacy)
+                except Exception:
+                    self._fallidos.add(nombre)
+            if not respaldo_vacio:
+                return None
+            return self._modelos.get("blank:es") or self._cargar("blank:es", spacy)
+
+    # Tiempo de carga y memoria de cada modelo cargado
+    def info(self):
+        return {nombre: dict(datos) for nombre, datos in self._info.items()}
+
+
+registro_modelos = RegistroModelos()
+
+
+def cargar_modelo_spacy(modelos=MODELOS_SPACY, respaldo_vacio=True):
     """
     Carga un modelo de spaCy para procesamiento en español.
 
@@ -130,35 +329,21 @@ def cargar_modelo_spacy():
     Si ninguno está disponible, crea un pipeline vacío para español (`spacy.blank("es")`)
     e intenta añadir un `sentencizer` para segmentación en oraciones.
 
+    El modelo se guarda en `registro_modelos`, así que las siguientes llamadas
+    devuelven el mismo objeto sin volver a llamar a `spacy.load`.
+
+    Args:
+        modelos (Iterable[str]): Cadena de modelos a probar en orden.
+        respaldo_vacio (bool): Usar `spacy.blank("es")` si ninguno carga.
+
     Returns:
         nlp (spacy.lang): Objeto de procesamiento lingüístico de spaCy.
         Si spaCy no está instalado, retorna `None`.
     """
-    if spacy is None:
+    if _importar("spacy") is None:
         print("Aviso: spaCy no instalado. Algunas funciones no estarán disponibles.")
         return None
-
-    modelos = ["es_core_news_sm", "es_core_news_md", "xx_sent_ud_sm"]
-
-    for m in modelos:
-        try:
-            nlp = spacy.load(m)
-            if "sentencizer" not in nlp.pipe_names:
-                try:
-                    nlp.add_pipe("sentencizer")
-                except Exception:
-                    pass
-            return nlp
-        except Exception:
-            continue
-
-    # Si no cargó ningún modelo, crear pipeline vacío
-    nlp = spacy.blank("es")
-    try:
-        nlp.add_pipe("sentencizer")
-    except Exception:
-        pass
-    return nlp
+    return registro_modelos.obtener(modelos, respaldo_vacio)
 
 
 def inicializar_nltk():
@@ -176,6 +361,7 @@ def inicializar_nltk():
     Returns:
         None
     """
+    nltk = _importar("nltk")
     if nltk is not None:
         try:
             nltk.data.find('tokenizers/punkt')
@@ -197,17 +383,282 @@ def inicializar_sentimiento():
             - Un pipeline de análisis de sentimiento si Transformers está disponible.
             - `None` si no se puede inicializar o la librería no está instalada.
     """
-    if pipeline is None:
+    transformers = _importar("transformers")
+    if transformers is None:
         return None
 
     try:
-        return pipeline(
+        return transformers.pipeline(
             "sentiment-analysis",
             model="nlptown/bert-base-multilingual-uncased-sentiment"
         )
     except Exception:
         return None
 
+
+# ----------------------
+# Caché de documentos spaCy
+# ----------------------
+class CacheDocs:
+    """
+    Caché LRU de objetos `Doc` de spaCy compartida por todos los analizadores.
+
+    La clave es el hash del contenido del texto (blake2b) junto con la
+    identidad del pipeline `nlp`, de modo que el mismo texto analizado con
+    el mismo modelo se parsea una sola vez aunque lo pidan el normalizador,
+    el NER, las palabras clave y el resumen.
+
+    Cada `Doc` guarda qué componentes se le han aplicado. Si una tarea
+    necesita alguno que falta (p. ej. el NER sobre un Doc del normalizador),
+    se ejecutan solo esos componentes sobre el Doc cacheado, en el orden
+    del pipeline; `tok2vec` y el resto de lo ya calculado no se repiten.
+
+    Atributos:
+    - max_docs (int): número máximo de documentos guardados.
+    - aciertos (int): veces que el `Doc` se sirvió desde la caché.
+    - completados (int): aciertos en los que hubo que aplicar componentes que faltaban.
+    - fallos (int): veces que hubo que llamar a `nlp(texto)`.
+    """
+    # Constructor con tamaño máximo; OrderedDict mantiene el orden de uso
+    def __init__(self, max_docs=128):
+        self.max_docs = max_docs
+        self.aciertos = 0
+        self.completados = 0
+        self.fallos = 0
+        self._docs = OrderedDict()
+
+    # Hash del contenido del texto
+    @staticmethod
+    def _hash(texto):
+        return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).digest()
+
+    # Devuelve el Doc con al menos los componentes no `desactivados`, procesándolo o completándolo si hace falta
+    def obtener(self, texto, nlp, desactivados=()):
+        clave = (id(nlp), self._hash(texto))
+        necesarios = [nombre for nombre in nlp.pipe_names if nombre not in desactivados]
+        entrada = self._docs.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            doc = nlp(texto, disable=desactivados) if desactivados else nlp(texto)
+            self._docs[clave] = (doc, set(necesarios))
+            if len(self._docs) > self.max_docs:
+                self._docs.popitem(last=False)
+            return doc
+        doc, aplicados = entrada
+        self._docs.move_to_end(clave)
+        self.aciertos += 1
+        faltan = [nombre for nombre in necesarios if nombre not in aplicados]
+        if faltan:
+            self.completados += 1
+            for nombre in faltan:
+                doc = nlp.get_pipe(nombre)(doc)
+            aplicados.update(faltan)
+            self._docs[clave] = (doc, aplicados)
+        return doc
+
+    # Vacía la caché y reinicia contadores
+    def limpiar(self):
+        self._docs.clear()
+        self.aciertos = 0
+        self.completados = 0
+        self.fallos = 0
+
+    # Resumen de uso de la caché
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            "docs": len(self._docs),
+            "max_docs": self.max_docs,
+            "aciertos": self.aciertos,
+            "completados": self.completados,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+        }
+
+
+cache_docs = CacheDocs()
+
+
+# Componentes de spaCy que necesita cada tarea; el resto se desactiva al procesar.
+# "sentencizer" basta para las oraciones del resumen (cargar_modelo_spacy siempre lo añade),
+# así que el parser solo se usa si el pipeline no tiene otro segmentador.
+COMPONENTES_TAREA = {
+    "normalizar": {"tok2vec", "tagger", "morphologizer", "attribute_ruler", "lemmatizer"},
+    "resumen": {"tok2vec", "tagger", "morphologizer", "attribute_ruler", "senter", "sentencizer"},
+    "entidades": {"tok2vec", "ner"},
+    "palabras_clave": {"tok2vec", "tagger", "morphologizer", "attribute_ruler"},
+}
+_desactivados_cache = {}
+
+
+# Componentes del pipeline que sobran para una tarea (tupla vacía si la tarea es None)
+def componentes_desactivados(nlp, tarea):
+    """
+    Calcula qué componentes de `nlp` pueden desactivarse para una tarea.
+
+    Args:
+        nlp: Pipeline spaCy.
+        tarea (str | None): Clave de `COMPONENTES_TAREA`; `None` usa el pipeline completo.
+
+    Returns:
+        tuple[str, ...]: Nombres de componentes a desactivar.
+    """
+    if tarea is None:
+        return ()
+    clave = (id(nlp), tuple(nlp.pipe_names), tarea)
+    if clave not in _desactivados_cache:
+        necesarios = COMPONENTES_TAREA[tarea]
+        if tarea == "resumen" and not necesarios & set(nlp.pipe_names) & {"senter", "sentencizer"}:
+            necesarios = necesarios | {"parser"}
+        _desactivados_cache[clave] = tuple(c for c in nlp.pipe_names if c not in necesarios)
+    return _desactivados_cache[clave]
+
+
+# Punto único de parseo: todos los analizadores piden aquí su Doc
+def procesar_doc(texto, nlp, tarea=None):
+    """
+    Devuelve el `Doc` de spaCy para `texto`, reutilizando la caché compartida.
+
+    Si se indica `tarea`, el texto se procesa solo con los componentes que
+    esa tarea necesita (ver `COMPONENTES_TAREA`). Un `Doc` ya cacheado se
+    reutiliza para cualquier tarea: si le faltan componentes, se le aplican
+    solo esos (ver `CacheDocs.obtener`).
+
+    Args:
+        texto (str): Texto a procesar.
+        nlp: Pipeline spaCy.
+        tarea (str | None): Tarea que va a usar el Doc.
+
+    Returns:
+        Doc: Documento procesado (el mismo objeto si ya estaba en caché).
+    """
+    return cache_docs.obtener(texto, nlp, componentes_desactivados(nlp, tarea))
+
+
+class CacheLemas:
+    """
+    Caché LRU de análisis por token: forma superficial -> (lema, categoría).
+
+    En corpus repetitivos casi todas las palabras ya se han visto. Con el
+    modo rápido de `normalizador_texto` y `extraer_palabras_clave` el texto
+    solo se tokeniza (`nlp.make_doc`) y, si todos sus tokens están en la
+    caché, se usan los lemas y categorías guardados sin pasar por el
+    tagger, el parser ni el lematizador.
+
+    Con `por_categoria=True` la clave es (forma, categoría): el lema no se
+    confunde entre categorías ("vino" verbo / nombre), pero la categoría
+    hay que calcularla, así que el modo rápido solo se ahorra el lematizador.
+
+    Atributos:
+    - max_entradas (int): número máximo de formas guardadas.
+    - por_categoria (bool): incluir la categoría (POS) en la clave.
+    - aciertos (int): tokens consultados que estaban en la caché.
+    - fallos (int): tokens consultados que no estaban en la caché.
+
+    La caché solo se consulta y se llena en modo rápido: el camino normal
+    no paga su mantenimiento.
+    """
+    # Constructor con tamaño máximo; OrderedDict mantiene el orden de uso
+    def __init__(self, max_entradas=100_000, por_categoria=False):
+        self.max_entradas = max_entradas
+        self.por_categoria = por_categoria
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+
+    # Clave de un token según el modo de la caché
+    def _clave(self, token):
+        return (token.text, token.pos_) if self.por_categoria else token.text
+
+    # Guarda el lema y la categoría de todos los tokens de un Doc lematizado
+    def registrar(self, doc):
+        if not doc.has_annotation("LEMMA"):
+            return
+        entradas = self._entradas
+        for token in doc:
+            clave = self._clave(token)
+            entradas[clave] = (token.lemma_, token.pos_)
+            entradas.move_to_end(clave)
+        while len(entradas) > self.max_entradas:
+            entradas.popitem(last=False)
+
+    # (lema, categoría) de cada token, o None si falta alguno; aciertos y fallos se cuentan por token
+    def buscar(self, doc):
+        entradas = self._entradas
+        claves = [self._clave(token) for token in doc]
+        valores = [entradas.get(clave) for clave in claves]
+        fallos = valores.count(None)
+        self.aciertos += len(valores) - fallos
+        self.fallos += fallos
+        if fallos:
+            # El Doc se analizará entero y `registrar` renovará todas sus formas
+            return None
+        for clave in claves:
+            entradas.move_to_end(clave)
+        return valores
+
+    # Vacía la caché y reinicia contadores
+    def limpiar(self):
+        self._entradas.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+    # Resumen de uso de la caché
+    def estadisticas(self):
+        total = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "max_entradas": self.max_entradas,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+        }
+
+
+cache_lemas = CacheLemas()
+
+
+# Doc y análisis por token para una tarea, usando la caché de lemas en modo rápido
+def procesar_doc_lemas(texto, nlp, tarea, rapido=False):
+    """
+    Devuelve el Doc de `texto` y, si salen de `cache_lemas`, sus (lema, categoría).
+
+    Sin `rapido` equivale a `procesar_doc` y no toca la caché. Con
+    `rapido`, primero se tokeniza solo; si todos los tokens están en la
+    caché se devuelve ese Doc sin analizar junto con los valores guardados.
+    Si falta alguno, se analiza el texto completo y sus formas se guardan.
+    Con una caché `por_categoria` se analiza sin lematizador y solo se
+    lematiza si falta alguna forma.
+
+    Returns:
+        tuple: (doc, valores). `valores` es una lista de (lema, categoría)
+        por token, o `None` si hay que leer `token.lemma_` / `token.pos_` del Doc.
+    """
+    if not rapido:
+        return procesar_doc(texto, nlp, tarea), None
+    lematizador = nlp.get_pipe("lemmatizer") if "lemmatizer" in nlp.pipe_names else None
+    if not cache_lemas.por_categoria:
+        doc = nlp.make_doc(texto)
+        valores = cache_lemas.buscar(doc)
+        if valores is not None:
+            return doc, valores
+        doc = procesar_doc(texto, nlp, tarea)
+    elif lematizador is not None:
+        # Análisis sin lematizador (el de palabras clave); solo se lematiza si falta alguna forma
+        doc = procesar_doc(texto, nlp, "palabras_clave")
+        if not doc.has_annotation("LEMMA"):
+            valores = cache_lemas.buscar(doc)
+            if valores is not None:
+                return doc, valores
+    else:
+        doc = procesar_doc(texto, nlp, tarea)
+    # La caché tiene que aprender también de las tareas que no lematizan: la caché
+    # de documentos completa el Doc con el lematizador y recuerda que ya lo tiene
+    if lematizador is not None and not doc.has_annotation("LEMMA"):
+        doc = procesar_doc(texto, nlp, "normalizar")
+    cache_lemas.registrar(doc)
+    return doc, None
+
 # ----------------------
 # Normalización
 # ----------------------
@@ -222,10 +673,501 @@ SUSTANTIVOS_NO_NEUTROS = {
     "niño": "el niño", "niña": "la niña", "camisa": "la camisa"
 }
 
+# ----------------------
+# Motor de correcciones
+# ----------------------
+# Clave del valor de corrección dentro de un nodo del trie (los tokens nunca son None)
+_FIN = None
+
+
+class MotorCorrecciones:
+    """
+    Aplica listas de correcciones (de una o varias palabras) con un trie de tokens.
+
+    Cada entrada es una secuencia de tokens en minúsculas ("en serio", "a el")
+    y su sustituto. El trie es un dict de dicts por token; un nodo sin
+    continuaciones se guarda directamente como el texto del sustituto, así
+    que las entradas de una sola palabra ocupan lo mismo que en un dict.
+    En cada posición se aplica la entrada más larga que empieza allí y se
+    sigue tras ella: una pasada lineal sobre los tokens (cada posición
+    mira como mucho tantos tokens como tenga la entrada más larga).
+
+    Los archivos son TSV ("incorrecto<TAB>correcto", con '#' para
+    comentarios) o JSON (objeto {incorrecto: correcto}). Si un archivo
+    cambia, `comprobar_cambios` lo recarga sin reiniciar el proceso; las
+    entradas de los archivos posteriores sustituyen a las anteriores.
+
+    Atributos:
+    - rutas (tuple[str]): Archivos de correcciones.
+    - intervalo_recarga (float): Segundos mínimos entre dos comprobaciones de los archivos.
+    """
+    # Constructor: correcciones fijas (dict) más las de los archivos
+    def __init__(self, correcciones=None, rutas=(), intervalo_recarga=2.0):
+        self.correcciones = dict(correcciones or {})
+        self.rutas = tuple(rutas)
+        self.intervalo_recarga = intervalo_recarga
+        self._raiz = {}
+        self._entradas = 0
+        self._versiones = {}
+        self._ultima_comprobacion = time.monotonic()
+        self.recargar()
+
+    # Entradas (clave, valor) de un archivo TSV o JSON
+    @staticmethod
+    def _leer(ruta):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            if ruta.lower().endswith(".json"):
+                yield from json.load(f).items()
+                return
+            for n, linea in enumerate(f, 1):
+                linea = linea.rstrip("\r\n")
+                if not linea.strip() or linea.lstrip().startswith("#"):
+                    continue
+                clave, separador, valor = linea.partition("\t")
+                if not separador:
+                    raise ValueError(f"{ruta}:{n}: se esperaba 'incorrecto<TAB>correcto'")
+                yield clave, valor
+
+    # Añade una entrada al trie
+    @staticmethod
+    def _insertar(raiz, tokens, valor):
+        nodo = raiz
+        for token in tokens[:-1]:
+            hijo = nodo.get(token)
+            if not isinstance(hijo, dict):
+                hijo = {} if hijo is None else {_FIN: hijo}
+                nodo[token] = hijo
+            nodo = hijo
+        hijo = nodo.get(tokens[-1])
+        if isinstance(hijo, dict):
+            hijo[_FIN] = valor
+        else:
+            nodo[tokens[-1]] = valor
+
+    # Vuelve a construir el trie con las correcciones fijas y el contenido actual de los archivos
+    def recargar(self):
+        """
+        Relee los archivos y sustituye el trie de una vez, así que quien esté
+        corrigiendo en otro hilo sigue usando el anterior hasta terminar.
+
+        Raises:
+            OSError, ValueError: Si un archivo no se puede leer o está mal formado
+            (el trie anterior se conserva).
+        """
+        versiones = {ruta: os.stat(ruta).st_mtime_ns for ruta in self.rutas}
+        raiz, entradas = {}, 0
+        for origen in (self.correcciones.items(), *(self._leer(ruta) for ruta in self.rutas)):
+            for clave, valor in origen:
+                tokens = clave.lower().split()
+                if tokens:
+                    self._insertar(raiz, tokens, valor)
+                    entradas += 1
+        self._raiz, self._entradas, self._versiones = raiz, entradas, versiones
+
+    # Recarga si algún archivo ha cambiado (como mucho una comprobación cada `intervalo_recarga` s)
+    def comprobar_cambios(self):
+        """
+        Returns:
+            bool: `True` si se ha recargado.
+        """
+        if not self.rutas or time.monotonic() - self._ultima_comprobacion < self.intervalo_recarga:
+            return False
+        self._ultima_comprobacion = time.monotonic()
+        try:
+            if all(os.stat(ruta).st_mtime_ns == self._versiones.get(ruta) for ruta in self.rutas):
+                return False
+            self.recargar()
+        except (OSError, ValueError) as e:
+            print(f"Aviso: no se pudieron recargar las correcciones ({e}); se mantienen las anteriores.")
+            return False
+        return True
+
+    def __len__(self):
+        return self._entradas
+
+    # Corrector que recibe los tokens de uno en uno (ver `CorreccionTokens`)
+    def nueva_correccion(self, sin_repeticiones=False):
+        return CorreccionTokens(self._raiz, sin_repeticiones)
+
+    # Aplica las correcciones a una lista de palabras
+    def corregir(self, palabras):
+        """
+        Args:
+            palabras (Iterable[str]): Tokens o palabras del texto.
+
+        Returns:
+            list[str]: Las palabras con las correcciones aplicadas (las no
+            corregidas conservan sus mayúsculas).
+        """
+        correccion = self.nueva_correccion()
+        for palabra in palabras:
+            correccion.agregar(palabra)
+        return correccion.terminar()
+
+
+class CorreccionTokens:
+    """
+    Aplica un trie de `MotorCorrecciones` a tokens que llegan de uno en uno.
+
+    Es la única implementación del recorrido: la usan `MotorCorrecciones.corregir`,
+    `corregir_palabras`, `_normalizar` (dentro de su única pasada por el Doc)
+    y el normalizador sin spaCy. Un token que no empieza ninguna entrada sale
+    en el acto; mientras puede continuar una entrada de varias palabras, los
+    tokens esperan en `_pendientes` hasta saber cuál es la entrada más larga
+    (como mucho tantos tokens como tenga la entrada más larga).
+
+    Con `sin_repeticiones` se descarta además un token no corregido igual
+    (sin distinguir mayúsculas) al token de entrada anterior.
+    """
+    # Constructor: trie del motor en este momento (una recarga no afecta a la corrección en curso)
+    def __init__(self, raiz, sin_repeticiones=False):
+        self._raiz = raiz
+        self._sin_repeticiones = sin_repeticiones
+        self.resultado = []
+        self._anterior = None     # último token de entrada ya resuelto, en minúsculas
+        self._pendientes = []     # (texto, minúsculas) leídos dentro de una entrada posible
+        self._nodo = None         # nodo del trie tras los pendientes
+        self._mejor = None        # (tokens cubiertos, sustituto) de la entrada completa más larga
+
+    # Recibe el siguiente token; `minusculas` evita volver a calcular token.lower()
+    def agregar(self, texto, minusculas=None):
+        if minusculas is None:
+            minusculas = texto.lower()
+        if self._pendientes:
+            hijo = self._nodo.get(minusculas)
+            if hijo is None:
+                self._resolver()
+                self.agregar(texto, minusculas)
+            elif isinstance(hijo, str):
+                self.resultado.append(hijo)
+                self._pendientes = []
+                self._anterior = minusculas
+            else:
+                self._pendientes.append((texto, minusculas))
+                self._nodo = hijo
+                if _FIN in hijo:
+                    self._mejor = (len(self._pendientes), hijo[_FIN])
+            return
+        nodo = self._raiz.get(minusculas)
+        if nodo is None:
+            if not self._sin_repeticiones or minusculas != self._anterior:
+                self.resultado.append(texto)
+        elif isinstance(nodo, str):
+            self.resultado.append(nodo)
+        else:
+            self._pendientes = [(texto, minusculas)]
+            self._nodo = nodo
+            self._mejor = (1, nodo[_FIN]) if _FIN in nodo else None
+            return
+        self._anterior = minusculas
+
+    # Cierra los pendientes cuando ya no pueden continuar: aplica la entrada más larga
+    # (o deja pasar el primer token) y vuelve a procesar los tokens que sobran
+    def _resolver(self):
+        pendientes, mejor = self._pendientes, self._mejor
+        self._pendientes, self._nodo, self._mejor = [], None, None
+        if mejor is None:
+            texto, minusculas = pendientes[0]
+            if not self._sin_repeticiones or minusculas != self._anterior:
+                self.resultado.append(texto)
+            usados = 1
+        else:
+            usados, sustituto = mejor
+            self.resultado.append(sustituto)
+        self._anterior = pendientes[usados - 1][1]
+        for texto, minusculas in pendientes[usados:]:
+            self.agregar(texto, minusculas)
+
+    # Resuelve lo que quede pendiente y devuelve los tokens corregidos
+    def terminar(self):
+        while self._pendientes:
+            self._resolver()
+        return self.resultado
+
+
+# El motor por defecto se crea en el primer uso con los diccionarios de arriba más
+# los archivos de la variable de entorno WORDCHEF_CORRECCIONES (separados por os.pathsep)
+_config_correcciones = {
+    "rutas": tuple(r for r in os.environ.get("WORDCHEF_CORRECCIONES", "").split(os.pathsep) if r),
+    "incluir_comunes": True,
+    "intervalo_recarga": 2.0,
+}
+_motor_correcciones = None
+
+
+# Cambia los archivos de correcciones; el nuevo motor se crea en el próximo uso
+def configurar_correcciones(rutas=(), incluir_comunes=True, intervalo_recarga=2.0):
+    """
+    Configura el motor de correcciones que usan `corregir_palabras` y `normalizador_texto`.
+
+    Args:
+        rutas (Iterable[str]): Archivos TSV o JSON de correcciones.
+        incluir_comunes (bool): Incluir `CORRECCIONES_COMUNES` y `SUSTANTIVOS_NO_NEUTROS`.
+        intervalo_recarga (float): Segundos entre comprobaciones de cambios en los archivos.
+    """
+    global _motor_correcciones
+    _config_correcciones.update(rutas=tuple(rutas), incluir_comunes=incluir_comunes,
+                                intervalo_recarga=intervalo_recarga)
+    _motor_correcciones = None
+
+
+# Devuelve el motor de correcciones, creándolo la primera vez
+def obtener_motor_correcciones():
+    """
+    Returns:
+        MotorCorrecciones: Motor compartido por el proceso.
+    """
+    global _motor_correcciones
+    if _motor_correcciones is None:
+        fijas = {**CORRECCIONES_COMUNES, **SUSTANTIVOS_NO_NEUTROS} if _config_correcciones["incluir_comunes"] else {}
+        _motor_correcciones = MotorCorrecciones(fijas, _config_correcciones["rutas"],
+                                                _config_correcciones["intervalo_recarga"])
+    return _motor_correcciones
+
+
+# ----------------------
+# Corrector ortográfico aproximado (borrado simétrico)
+# ----------------------
+# Palabras del texto que pasan por el corrector: solo letras (sin dígitos ni _)
+_RE_PALABRA = re.compile(r"[^\W\d_]+")
+
+
+# Distancia de Damerau-Levenshtein (transposiciones adyacentes) o None si supera `maximo`
+def _distancia_edicion(a, b, maximo):
+    if abs(len(a) - len(b)) > maximo:
+        return None
+    # El prefijo y el sufijo comunes no cambian la distancia: la tabla solo cubre lo que difiere
+    inicio = 0
+    while inicio < len(a) and inicio < len(b) and a[inicio] == b[inicio]:
+        inicio += 1
+    fin_a, fin_b = len(a), len(b)
+    while fin_a > inicio and fin_b > inicio and a[fin_a - 1] == b[fin_b - 1]:
+        fin_a -= 1
+        fin_b -= 1
+    a, b = a[inicio:fin_a], b[inicio:fin_b]
+    if not a or not b:
+        return max(len(a), len(b))
+    infinito = maximo + 1
+    anterior2, anterior = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        fila = [i] + [infinito] * len(b)
+        # Solo hace falta la banda |i - j| <= maximo: fuera de ella la distancia ya es mayor
+        for j in range(max(1, i - maximo), min(len(b), i + maximo) + 1):
+            coste = a[i - 1] != b[j - 1]
+            fila[j] = min(anterior[j] + 1, fila[j - 1] + 1, anterior[j - 1] + coste)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                fila[j] = min(fila[j], anterior2[j - 2] + 1)
+        if min(fila) > maximo:
+            return None
+        anterior2, anterior = anterior, fila
+    return anterior[-1] if anterior[-1] <= maximo else None
+
+
+class CorrectorDifuso:
+    """
+    Corrector ortográfico aproximado con índice de borrados simétricos (SymSpell).
+
+    Al cargar el léxico se guardan, para cada palabra, todas las variantes
+    que resultan de borrarle hasta `distancia_maxima` letras (de sus
+    primeros `longitud_prefijo` caracteres). Para corregir una palabra
+    desconocida se generan sus propias variantes (unas decenas) y los
+    candidatos son las palabras del léxico que comparten alguna; solo a
+    esos pocos candidatos se les calcula la distancia de edición. El coste
+    por palabra no depende del tamaño del léxico.
+
+    Se elige el candidato más cercano y, a igual distancia, el más frecuente.
+    Las palabras del léxico y las más cortas que `longitud_minima` no se tocan.
+
+    Atributos:
+    - distancia_maxima (int): Ediciones máximas entre la palabra y la corrección.
+    - longitud_prefijo (int): Caracteres indexados de cada palabra.
+    - longitud_minima (int): Longitud mínima para intentar corregir.
+    """
+    # Tamaño máximo de la caché de palabras ya corregidas
+    MAX_CACHE = 1 << 16
+
+    # Constructor: índice vacío
+    def __init__(self, distancia_maxima=2, longitud_prefijo=7, longitud_minima=3):
+        self.distancia_maxima = distancia_maxima
+        self.longitud_prefijo = longitud_prefijo
+        self.longitud_minima = longitud_minima
+        self._frecuencias = {}
+        self._borrados = {}
+        self._cache = {}
+
+    # Variantes de la palabra con hasta `distancia_maxima` letras borradas (de su prefijo)
+    def _variantes(self, palabra):
+        frontera = variantes = {palabra[:self.longitud_prefijo]}
+        for _ in range(self.distancia_maxima):
+            frontera = {v[:i] + v[i + 1:] for v in frontera for i in range(len(v))} - variantes
+            variantes = variantes | frontera
+        return variantes
+
+    # Añade una palabra al léxico (o suma a su frecuencia)
+    def agregar(self, palabra, frecuencia=1):
+        palabra = palabra.lower()
+        if palabra not in self._frecuencias:
+            for variante in self._variantes(palabra):
+                palabras = self._borrados.get(variante)
+                # Una sola palabra se guarda tal cual; varias, en una lista
+                if palabras is None:
+                    self._borrados[variante] = palabra
+                elif isinstance(palabras, list):
+                    palabras.append(palabra)
+                else:
+                    self._borrados[variante] = [palabras, palabra]
+        self._frecuencias[palabra] = self._frecuencias.get(palabra, 0) + frecuencia
+        if self._cache:
+            self._cache.clear()
+
+    # Carga un léxico de frecuencias: "palabra frecuencia" por línea (frecuencia opcional)
+    def cargar_lexico(self, ruta):
+        """
+        Args:
+            ruta (str): Archivo UTF-8 con una palabra por línea, seguida
+                opcionalmente de su frecuencia (separada por espacio o
+                tabulador). Las líneas vacías o que empiezan por '#' se ignoran.
+
+        Returns:
+            int: Número de palabras en el léxico tras la carga.
+        """
+        with open(ruta, 'r', encoding='utf-8') as f:
+            for n, linea in enumerate(f, 1):
+                campos = linea.split()
+                if not campos or campos[0].startswith("#"):
+                    continue
+                try:
+                    frecuencia = int(campos[1]) if len(campos) > 1 else 1
+                except ValueError:
+                    raise ValueError(f"{ruta}:{n}: frecuencia no válida: {campos[1]!r}") from None
+                self.agregar(campos[0], frecuencia)
+        return len(self)
+
+    def __len__(self):
+        return len(self._frecuencias)
+
+    # Mejor corrección (en minúsculas) de una palabra, o None si no hay ninguna cercana
+    def sugerencia(self, palabra):
+        """
+        Args:
+            palabra (str): Palabra a corregir.
+
+        Returns:
+            str | None: La propia palabra si está en el léxico, la corrección
+            más probable si hay alguna a `distancia_maxima` o menos, o `None`.
+        """
+        palabra = palabra.lower()
+        if palabra in self._frecuencias:
+            return palabra
+        # Se recorren las variantes por número de borrados: una palabra a distancia d
+        # ya aparece con d borrados, así que en cuanto hay una corrección a distancia
+        # <= borrados no hace falta seguir (la más cercana gana a la más frecuente)
+        frontera = vistas = {palabra[:self.longitud_prefijo]}
+        revisados = set()
+        mejor, clave_mejor = None, None
+        for borrados in range(self.distancia_maxima + 1):
+            for variante in frontera:
+                palabras = self._borrados.get(variante)
+                if palabras is None:
+                    continue
+                for candidato in (palabras if isinstance(palabras, list) else (palabras,)):
+                    if candidato in revisados:
+                        continue
+                    revisados.add(candidato)
+                    # Con una corrección ya encontrada, solo interesan candidatos igual de cercanos o más
+                    limite = clave_mejor[0] if clave_mejor is not None else self.distancia_maxima
+                    distancia = _distancia_edicion(palabra, candidato, limite)
+                    if distancia is not None:
+                        clave = (distancia, -self._frecuencias[candidato])
+                        if clave_mejor is None or clave < clave_mejor:
+                            mejor, clave_mejor = candidato, clave
+            if clave_mejor is not None and clave_mejor[0] <= borrados:
+                break
+            frontera = {v[:i] + v[i + 1:] for v in frontera for i in range(len(v))} - vistas
+            vistas = vistas | frontera
+        return mejor
+
+    # Corrige una palabra conservando sus mayúsculas; si no hay corrección la devuelve igual
+    def corregir_palabra(self, palabra):
+        corregida = self._cache.get(palabra)
+        if corregida is None:
+            corregida = palabra
+            if len(palabra) >= self.longitud_minima:
+                sugerida = self.sugerencia(palabra)
+                if sugerida is not None and sugerida != palabra.lower():
+                    if palabra.isupper():
+                        corregida = sugerida.upper()
+                    elif palabra[0].isupper():
+                        corregida = sugerida[0].upper() + sugerida[1:]
+                    else:
+                        corregida = sugerida
+            if len(self._cache) >= self.MAX_CACHE:
+                self._cache.clear()
+            self._cache[palabra] = corregida
+        return corregida
+
+    # Corrige las palabras de un texto sin tocar espacios, signos ni números
+    def corregir_texto(self, texto):
+        return _RE_PALABRA.sub(lambda m: self.corregir_palabra(m.group()), texto)
+
+
+# El corrector aproximado es opcional: solo existe si hay léxico, fijado con
+# `configurar_corrector_difuso` o con la variable de entorno WORDCHEF_LEXICO
+_config_difuso = {"lexico": os.environ.get("WORDCHEF_LEXICO") or None, "distancia_maxima": 2}
+_corrector_difuso = None
+
+
+# Cambia el léxico del corrector aproximado; se carga en el próximo uso
+def configurar_corrector_difuso(lexico=None, distancia_maxima=2):
+    """
+    Configura el corrector que rellena `corregido_difuso` en `normalizador_texto`.
+
+    Args:
+        lexico (str | None): Archivo de frecuencias (ver `CorrectorDifuso.cargar_lexico`);
+            `None` desactiva el corrector.
+        distancia_maxima (int): Ediciones máximas por palabra.
+    """
+    global _corrector_difuso
+    _config_difuso.update(lexico=lexico, distancia_maxima=distancia_maxima)
+    _corrector_difuso = None
+
+
+# Devuelve el corrector aproximado, cargando el léxico la primera vez (None si no hay léxico)
+def obtener_corrector_difuso():
+    """
+    Returns:
+        CorrectorDifuso | None: Corrector compartido por el proceso.
+    """
+    global _corrector_difuso
+    if _corrector_difuso is None and _config_difuso["lexico"]:
+        corrector = CorrectorDifuso(_config_difuso["distancia_maxima"])
+        corrector.cargar_lexico(_config_difuso["lexico"])
+        _corrector_difuso = corrector
+    return _corrector_difuso
+
+
+# Corrección en curso con el motor por defecto (recargado si cambió) y sin repeticiones seguidas
+def _nueva_correccion():
+    motor = obtener_motor_correcciones()
+    motor.comprobar_cambios()
+    return motor.nueva_correccion(sin_repeticiones=True)
+
+
+# Corrige una lista de tokens (textos) y quita los repetidos seguidos
+def _corregir_tokens(tokens):
+    correccion = _nueva_correccion()
+    for token in tokens:
+        correccion.agregar(token)
+    return " ".join(correccion.terminar())
+
+
 # Corrige palabras comunes y evita repeticiones consecutivas en un doc spaCy
 def corregir_palabras(doc):
     """
     Corrige errores ortográficos comunes y evita repeticiones consecutivas.
+
+    Las correcciones vienen del motor de correcciones (`obtener_motor_correcciones`)
+    e incluyen entradas de varias palabras.
     
     Args:
         doc: Documento spaCy procesado.
@@ -235,56 +1177,198 @@ def corregir_palabras(doc):
     """
     if doc is None:
         return ""
-    corregido = []
-    for i, token in enumerate(doc):
-        palabra = token.text.lower()
-        if palabra in CORRECCIONES_COMUNES:
-            corregido.append(CORRECCIONES_COMUNES[palabra])
-            continue
-        if palabra in SUSTANTIVOS_NO_NEUTROS:
-            corregido.append(SUSTANTIVOS_NO_NEUTROS[palabra])
-            continue
-        if i > 0 and palabra == doc[i-1].text.lower():
-            continue
-        corregido.append(token.text)
-    return " ".join(corregido)
+    return _corregir_tokens([token.text for token in doc])
+
+# ----------------------
+# Lematización sin spaCy
+# ----------------------
+# Tabla de lemas precompilada (wordChef_lemas) para normalizar sin spaCy. Se abre
+# en el primer uso desde `configurar_lemas` o la variable de entorno WORDCHEF_LEMAS
+_config_lemas = {"tabla": os.environ.get("WORDCHEF_LEMAS") or None}
+_tabla_lemas = None
+
+# Tokens aproximados a los de spaCy cuando no hay Doc: palabras y signos sueltos
+_RE_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+# Cambia la tabla de lemas; se abre en el próximo uso
+def configurar_lemas(tabla=None):
+    """
+    Configura la tabla de lemas que usa `normalizador_texto` cuando no hay spaCy.
+
+    Args:
+        tabla (str | None): Archivo compilado con `wordChef_lemas.py compilar`;
+            `None` la desactiva.
+    """
+    global _tabla_lemas
+    if _tabla_lemas is not None:
+        _tabla_lemas.cerrar()
+    _config_lemas["tabla"] = tabla
+    _tabla_lemas = None
+
+
+# Devuelve la tabla de lemas, abriéndola la primera vez (None si no hay tabla)
+def obtener_tabla_lemas():
+    """
+    Returns:
+        TablaLemas | None: Tabla compartida por el proceso.
+    """
+    global _tabla_lemas
+    if _tabla_lemas is None and _config_lemas["tabla"]:
+        from wordChef_lemas import TablaLemas
+        _tabla_lemas = TablaLemas(_config_lemas["tabla"])
+    return _tabla_lemas
+
 
 # Normaliza el texto: lematiza, elimina repeticiones, corrige palabras, usando spaCy si está
-def normalizador_texto(texto, nlp):
+def normalizador_texto(texto, nlp, rapido=False):
     """
     Normaliza texto: lematiza, elimina repeticiones y corrige palabras.
     
     Args:
         texto (str): Texto original a procesar.
         nlp: Pipeline spaCy para lematización.
+        rapido (bool): Tomar los lemas de `cache_lemas` cuando todas las
+            palabras ya se han visto (ver `procesar_doc_lemas`).
     
     Returns:
-        tuple: (original, lematizado, sin_repeticiones, corregido)
+        dict: original, lematizado, sin_repeticiones, corregido y
+        corregido_difuso (corrección ortográfica aproximada con el corrector
+        de `configurar_corrector_difuso`; `None` si no hay léxico configurado).
     """
     if not texto or len(texto.strip()) == 0:
         return None
     if nlp is None:
-        palabras = texto.split()
-        sin_repeticiones = " ".join([palabras[i] for i in range(len(palabras)) if i == 0 or palabras[i].lower() != palabras[i-1].lower()])
-        return {"original": texto, "lematizado": "(spaCy requerido)", "sin_repeticiones": sin_repeticiones, "corregido": "(spaCy requerido)"}
-    doc = nlp(texto)
-    lematizado = " ".join([t.lemma_ for t in doc])
-    palabras = texto.split()
-    sin_repeticiones = " ".join([palabras[i] for i in range(len(palabras)) if i == 0 or palabras[i].lower() != palabras[i-1].lower()])
-    texto_corregido = corregir_palabras(doc)
-    return {"original": texto, "lematizado": lematizado, "sin_repeticiones": sin_repeticiones, "corregido": texto_corregido}
+        return _normalizar(texto, None)
+    return _normalizar(texto, *procesar_doc_lemas(texto, nlp, "normalizar", rapido))
 
 
+# Cuerpo del normalizador a partir de un Doc ya procesado (o None sin spaCy)
+def _normalizar(texto, doc, valores=None):
+    """
+    Calcula las salidas del normalizador en una sola pasada por el Doc.
+
+    `corregido` sale de una `CorreccionTokens` que recibe cada token en
+    esa misma pasada, igual que en `corregir_palabras`.
+
+    Con `valores` (lema, categoría) por token, los lemas salen de ahí en
+    lugar de `token.lemma_` (Doc solo tokenizado del modo rápido).
+    Sin Doc, los lemas salen de la tabla de `configurar_lemas` si la hay.
+
+    Las palabras de `sin_repeticiones` son las de `texto.split()`: se
+    reconstruyen juntando tokens hasta uno seguido de espacio
+    (`token.whitespace_`) o hasta un token de espacios (`token.is_space`),
+    así que no hace falta volver a partir el texto.
+    """
+    difuso = obtener_corrector_difuso()
+    if doc is None:
+        tabla = obtener_tabla_lemas()
+        if tabla is None:
+            lematizado = corregido = "(spaCy requerido)"
+        else:
+            tokens = _RE_TOKEN.findall(texto)
+            lematizado = " ".join([tabla.lema(t) for t in tokens])
+            corregido = _corregir_tokens(tokens)
+        return {"original": texto, "lematizado": lematizado,
+                "sin_repeticiones": _sin_repeticiones(texto), "corregido": corregido,
+                "corregido_difuso": difuso.corregir_texto(texto) if difuso is not None else None}
+    correccion = _nueva_correccion()
+    agregar_token = correccion.agregar
+    lemas, palabras, aproximado = [], [], []
+    palabra_anterior = None   # última palabra en minúsculas (repeticiones de `sin_repeticiones`)
+    palabra = ""              # palabra en construcción
+    for i, token in enumerate(doc):
+        texto_token = token.text
+        lemas.append(token.lemma_ if valores is None else valores[i][0])
+        agregar_token(texto_token, token.lower_)
+        if difuso is not None:
+            aproximado.append(difuso.corregir_palabra(texto_token) if token.is_alpha else texto_token)
+            aproximado.append(token.whitespace_)
+        if not token.is_space:
+            palabra += texto_token
+            if not token.whitespace_:
+                continue
+        if palabra:
+            minusculas = palabra.lower()
+            if minusculas != palabra_anterior:
+                palabras.append(palabra)
+                palabra_anterior = minusculas
+            palabra = ""
+    if palabra and palabra.lower() != palabra_anterior:
+        palabras.append(palabra)
+    return {"original": texto, "lematizado": " ".join(lemas),
+            "sin_repeticiones": " ".join(palabras), "corregido": " ".join(correccion.terminar()),
+            "corregido_difuso": "".join(aproximado) if difuso is not None else None}
+
+
+# Palabras de `texto.split()` sin repeticiones consecutivas (sin distinguir mayúsculas)
+def _sin_repeticiones(texto):
+    palabras = []
+    anterior = None
+    for palabra in texto.split():
+        minusculas = palabra.lower()
+        if minusculas != anterior:
+            palabras.append(palabra)
+            anterior = minusculas
+    return " ".join(palabras)
+
+
+# ----------------------
+# Patrones con RE
 # ----------------------
-# Patrones con RE
-# ----------------------
-# Expresiones regulares para fechas, dinero y correos electrónicos
+# Expresiones regulares para fechas, dinero y correos electrónicos.
+# Los patrones de dinero y correo solo empiezan al principio de una secuencia
+# de dígitos / caracteres de usuario (lookbehind negativo). Sin eso, un texto
+# como "1,234,234,..." o "a.a.a.a..." sin moneda ni @ hace que el motor
+# recorra la secuencia entera desde cada posición: coste cuadrático.
+# Con el lookbehind cada secuencia se recorre una vez y el coste es lineal.
+# En el correo el lookbehind rechaza cualquier carácter de palabra (\w, también
+# "í" o "ñ"), como hacía el \b original: así "maría@..." no se lee como "a@...".
+# Como la coincidencia empieza al principio de la secuencia, los signos . % + -
+# que preceden a la dirección ("...a@b.com", "(+juan@x.com)") quedan dentro;
+# `_coincidencia` y `encontrar_correos` los quitan, igual que hacía el \b original.
 PATRON_FECHAS = r"\b(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}[/-]\d{1,2}[/-]\d{1,2})\b"
-PATRON_DINERO = r"\b(?:€?\s?\d{1,3}(?:[\.,]\d{3})*(?:[\.,]\d+)?\s?(?:€|euros|USD|\$)|\$\d+(?:\.\d+)?\b)"
-PATRON_EMAIL = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
+PATRON_DINERO = r"\b(?:€?\s?(?<!\d)(?<!\d[\.,])\d{1,3}(?:[\.,]\d{3})*(?:[\.,]\d+)?\s?(?:€|euros|USD|\$)|\$\d+(?:\.\d+)?\b)"
+PATRON_EMAIL = r"(?<![\w.%+-])[.%+-]*[A-Za-z0-9_][A-Za-z0-9._%+-]*@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"
+# Signos que PATRON_EMAIL puede incluir delante de la dirección
+_PREFIJO_CORREO = ".%+-"
+
+# Patrones precompilados una sola vez al importar el módulo
+PATRONES = {"fechas": PATRON_FECHAS, "dinero": PATRON_DINERO, "correos": PATRON_EMAIL}
+_RE_FECHAS = re.compile(PATRON_FECHAS)
+_RE_DINERO = re.compile(PATRON_DINERO)
+_RE_EMAIL = re.compile(PATRON_EMAIL)
+
+# Prefiltros: comprobaciones baratas que descartan el texto antes de lanzar el regex.
+# Se usan varios `in` en lugar de un regex de una pasada porque la búsqueda de
+# subcadenas de CPython es mucho más rápida que arrancar el motor de regex.
+_RE_DIGITO = re.compile(r"\d")
+
+
+# ¿Hay algún dígito? (\d de `re` también acepta dígitos Unicode no ASCII)
+def _hay_digito(texto):
+    return any(d in texto for d in "0123456789") or (not texto.isascii() and _RE_DIGITO.search(texto) is not None)
+
+
+# Toda fecha tiene un separador / o - y dígitos
+def _puede_haber_fecha(texto):
+    return ("/" in texto or "-" in texto) and _hay_digito(texto)
+
+
+# Toda cantidad lleva €, $, "euros" o "USD"
+def _puede_haber_dinero(texto):
+    return "€" in texto or "$" in texto or "euros" in texto or "USD" in texto
+
+
+# Todo correo lleva @
+def _puede_haber_correo(texto):
+    return "@" in texto
+
+
+PREFILTROS = {"fechas": _puede_haber_fecha, "dinero": _puede_haber_dinero, "correos": _puede_haber_correo}
 
 # Funciones para buscar patrones en texto usando re.findall
-def encontrar_fechas(texto): return re.findall(PATRON_FECHAS, texto)
+def encontrar_fechas(texto): return _RE_FECHAS.findall(texto) if _puede_haber_fecha(texto) else []
 """
     Extrae patrones de fechas del texto usando expresiones regulares.
     
@@ -294,7 +1378,7 @@ def encontrar_fechas(texto): return re.findall(PATRON_FECHAS, texto)
     Returns:
         list[str]: Lista de fechas encontradas.
     """
-def encontrar_dinero(texto): return re.findall(PATRON_DINERO, texto)
+def encontrar_dinero(texto): return _RE_DINERO.findall(texto) if _puede_haber_dinero(texto) else []
 """
     Extrae patrones monetarios (euros, USD) del texto.
     
@@ -304,7 +1388,7 @@ def encontrar_dinero(texto): return re.findall(PATRON_DINERO, texto)
     Returns:
         list[str]: Lista de cantidades monetarias.
     """
-def encontrar_correos(texto): return re.findall(PATRON_EMAIL, texto)
+def encontrar_correos(texto): return [c.lstrip(_PREFIJO_CORREO) for c in _RE_EMAIL.findall(texto)] if _puede_haber_correo(texto) else []
 """
     Extrae direcciones de email del texto.
     
@@ -315,6 +1399,714 @@ def encontrar_correos(texto): return re.findall(PATRON_EMAIL, texto)
         list[str]: Lista de correos electrónicos.
     """
 
+
+class Coincidencia(NamedTuple):
+    """Coincidencia de un patrón: tipo ('fechas', 'dinero', 'correos' o uno registrado), texto y offsets [inicio, fin)."""
+    tipo: str
+    texto: str
+    inicio: int
+    fin: int
+
+
+# Coincidencia a partir de un match del patrón combinado; en los correos se quita el prefijo . % + -
+def _coincidencia(m, base=0):
+    texto = m.group()
+    if m.lastgroup == "correos":
+        texto = texto.lstrip(_PREFIJO_CORREO)
+        return Coincidencia("correos", texto, base + m.end() - len(texto), base + m.end())
+    return Coincidencia(m.lastgroup, texto, base + m.start(), base + m.end())
+
+
+# Alternancias combinadas ya compiladas, por tupla de tipos
+_combinados = {}
+
+
+# Une los patrones pedidos en una alternancia con un grupo con nombre por tipo
+def _patron_combinado(tipos):
+    if tipos not in _combinados:
+        _combinados[tipos] = re.compile("|".join(f"(?P<{tipo}>{PATRONES[tipo]})" for tipo in tipos))
+    return _combinados[tipos]
+
+
+# Tupla de tipos a buscar, en el orden de PATRONES (todos si `tipos` es None)
+def _tipos_pedidos(tipos):
+    if tipos is None:
+        return tuple(PATRONES)
+    pedidos = set(tipos)
+    return tuple(t for t in PATRONES if t in pedidos)
+
+
+# ----------------------
+# Registro de patrones de usuario
+# ----------------------
+# Tipos que vienen con wordChef; no se pueden sustituir ni eliminar
+TIPOS_INCLUIDOS = ("fechas", "dinero", "correos")
+
+
+# Convierte la especificación de prefiltro (None, literal, lista de literales o función) en una función
+def _crear_prefiltro(prefiltro):
+    if prefiltro is None:
+        return lambda texto: True
+    if callable(prefiltro):
+        return prefiltro
+    literales = (prefiltro,) if isinstance(prefiltro, str) else tuple(prefiltro)
+    return lambda texto: any(literal in texto for literal in literales)
+
+
+# Añade un tipo de patrón que se busca junto a los incluidos en la misma pasada
+def registrar_tipo_patron(tipo, patron, prefiltro=None):
+    """
+    Registra un patrón de usuario (IBAN, teléfono, DNI, URL...).
+
+    El patrón se añade a `PATRONES` y entra en la misma alternancia que
+    fechas, dinero y correos, así que no cuesta una pasada extra sobre el
+    texto. Los patrones combinados se recompilan una sola vez en la
+    siguiente búsqueda.
+
+    Args:
+        tipo (str): Nombre del tipo; debe ser un identificador válido
+            (se usa como nombre de grupo).
+        patron (str): Expresión regular. No puede tener grupos con nombre ni
+            flags globales; para flags usa la forma local `(?i:...)`.
+        prefiltro (str | Iterable[str] | Callable | None): Literal(es) de los
+            que al menos uno debe aparecer en el texto, o una función
+            `texto -> bool`. `None` ejecuta siempre el patrón.
+
+    Raises:
+        ValueError: Si el tipo es de los incluidos o el patrón no es válido.
+    """
+    if not tipo.isidentifier():
+        raise ValueError(f"El tipo {tipo!r} no es un identificador válido.")
+    if tipo in TIPOS_INCLUIDOS:
+        raise ValueError(f"El tipo {tipo!r} es de los incluidos y no se puede sustituir.")
+    try:
+        compilado = re.compile(patron)
+        # Se compila también dentro de un grupo para detectar flags globales
+        re.compile(f"(?:x)|(?P<{tipo}>{patron})")
+    except re.error as e:
+        raise ValueError(f"Patrón inválido para {tipo!r}: {e}") from e
+    if compilado.groupindex:
+        raise ValueError(f"El patrón de {tipo!r} no puede tener grupos con nombre.")
+    PATRONES[tipo] = patron
+    PREFILTROS[tipo] = _crear_prefiltro(prefiltro)
+    _combinados.clear()
+
+
+# Quita un tipo de patrón de usuario
+def eliminar_tipo_patron(tipo):
+    """
+    Elimina un patrón registrado con `registrar_tipo_patron`.
+
+    Raises:
+        ValueError: Si el tipo es de los incluidos.
+        KeyError: Si el tipo no está registrado.
+    """
+    if tipo in TIPOS_INCLUIDOS:
+        raise ValueError(f"El tipo {tipo!r} es de los incluidos y no se puede eliminar.")
+    del PATRONES[tipo]
+    del PREFILTROS[tipo]
+    _combinados.clear()
+
+
+# Carga patrones de usuario desde un archivo JSON
+def cargar_patrones(ruta):
+    """
+    Registra los patrones definidos en un archivo JSON.
+
+    Formato: un objeto cuyas claves son los tipos y cuyos valores son el
+    patrón (cadena) o un objeto `{"patron": ..., "prefiltro": ...}`:
+
+        {
+            "url": "\\bhttps?://[^\\s<>\"]+",
+            "iban": {"patron": "\\bES\\d{2}(?:\\s?\\d{4}){5}\\b", "prefiltro": ["ES"]}
+        }
+
+    Args:
+        ruta (str): Ruta del archivo JSON (UTF-8).
+
+    Returns:
+        list[str]: Tipos registrados, en el orden del archivo.
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        definiciones = json.load(f)
+    for tipo, definicion in definiciones.items():
+        if isinstance(definicion, str):
+            registrar_tipo_patron(tipo, definicion)
+        else:
+            registrar_tipo_patron(tipo, definicion["patron"], definicion.get("prefiltro"))
+    return list(definiciones)
+
+
+# Tamaño de bloque con el que se comprueba el límite de tiempo de encontrar_patrones
+TAM_BLOQUE_LIMITE = 1 << 16
+
+
+# Busca todos los patrones en una sola pasada y devuelve coincidencias con offsets
+def encontrar_patrones(texto, tipos=None, limite_segundos=None):
+    """
+    Busca fechas, cantidades y correos (y los patrones registrados con
+    `registrar_tipo_patron`) recorriendo el texto una sola vez.
+
+    Los patrones se combinan en una única expresión regular con un grupo
+    con nombre por tipo, así que el coste es el de un solo `finditer` en
+    lugar de un `findall` por tipo. Si dos patrones se solapan gana la coincidencia
+    que empieza antes (y, a igual posición, el orden de `PATRONES`).
+    Los tipos cuyo prefiltro (`PREFILTROS`) descarta el texto no entran en
+    la alternancia.
+
+    Con `limite_segundos` el texto se recorre en bloques de
+    `TAM_BLOQUE_LIMITE` caracteres y se comprueba el reloj entre bloques
+    (también tras el único bloque de un texto corto), de modo que un texto
+    anómalo no bloquea al proceso que lo analiza. `_buscar_patrones`,
+    `analizar_todo`, `encontrar_patrones_archivo` y los trabajadores de
+    `wordChef_paralelo` aceptan el mismo límite.
+
+    Args:
+        texto (str): Texto a analizar.
+        tipos (Iterable[str] | None): Subconjunto de `PATRONES` a buscar; todos si es `None`.
+        limite_segundos (float | None): Tiempo máximo de búsqueda.
+
+    Returns:
+        list[Coincidencia]: Coincidencias en orden de aparición.
+
+    Raises:
+        TimeoutError: Si se supera `limite_segundos`.
+    """
+    tipos = tuple(t for t in _tipos_pedidos(tipos) if PREFILTROS[t](texto))
+    if not tipos:
+        return []
+    if limite_segundos is not None:
+        return list(encontrar_patrones_flujo(io.StringIO(texto), tipos, TAM_BLOQUE_LIMITE,
+                                             limite_segundos=limite_segundos))
+    return [_coincidencia(m) for m in _patron_combinado(tipos).finditer(texto)]
+
+
+# Tamaño de bloque y solape por defecto para el escaneo en streaming
+TAM_BLOQUE = 1 << 20
+SOLAPE = 1024
+# Caracteres ya procesados que se conservan para que \b y los lookbehind vean su contexto
+_CONTEXTO = 16
+
+
+# Recorre un flujo de texto por bloques de tamaño fijo con solape entre bloques
+def _recorrer_flujo(archivo, patron, tam_bloque=TAM_BLOQUE, solape=SOLAPE, limite_segundos=None):
+    """
+    Aplica `patron` a un archivo de texto sin cargarlo entero en memoria.
+
+    Se lee en bloques de `tam_bloque` caracteres. Solo se aceptan las
+    coincidencias que empiezan antes de los últimos `solape` caracteres del
+    buffer; el resto se deja para la siguiente vuelta, cuando ya se conoce
+    el texto que sigue. Así no se pierden coincidencias que cruzan el borde
+    de un bloque, siempre que ninguna sea más larga que `solape`.
+    Con `limite_segundos` se lanza `TimeoutError` si entre dos bloques ya se
+    ha superado el tiempo.
+
+    Yields:
+        tuple: (base, buffer, desde, hasta, coincidencias). `buffer[desde:hasta]`
+        es el tramo resuelto en esta vuelta (cada carácter del flujo aparece
+        en exactamente un tramo), `coincidencias` son los `re.Match` que
+        empiezan en él y `base` es la posición de `buffer[0]` en el flujo.
+    """
+    fin = time.perf_counter() + limite_segundos if limite_segundos is not None else None
+    base, buffer, desde = 0, "", 0
+    while True:
+        if fin is not None and time.perf_counter() > fin:
+            raise TimeoutError(f"Búsqueda de patrones interrumpida tras {limite_segundos} s (posición {base + desde})")
+        bloque = archivo.read(tam_bloque)
+        final = not bloque
+        buffer += bloque
+        limite = len(buffer) if final else len(buffer) - solape
+        if limite > desde or final:
+            hasta = max(limite, desde)
+            coincidencias = []
+            for m in patron.finditer(buffer, desde):
+                if not final and m.start() >= limite:
+                    break
+                coincidencias.append(m)
+                hasta = max(hasta, m.end())
+            yield base, buffer, desde, hasta, coincidencias
+            desde = hasta
+        if final:
+            return
+        recorte = max(0, desde - _CONTEXTO)
+        buffer = buffer[recorte:]
+        base += recorte
+        desde -= recorte
+
+
+# Busca patrones en un archivo ya abierto, bloque a bloque
+def encontrar_patrones_flujo(archivo, tipos=None, tam_bloque=TAM_BLOQUE, solape=SOLAPE, limite_segundos=None):
+    """
+    Versión en streaming de `encontrar_patrones` para archivos de texto abiertos.
+
+    La memoria usada es del orden de `tam_bloque + solape` caracteres,
+    independientemente del tamaño del archivo.
+
+    Args:
+        archivo: Objeto de texto con `read(n)` (p. ej. `open(ruta, encoding='utf-8')`).
+        tipos (Iterable[str] | None): Subconjunto de `PATRONES`; todos si es `None`.
+        tam_bloque (int): Caracteres leídos en cada bloque.
+        solape (int): Longitud máxima de una coincidencia que cruza bloques.
+        limite_segundos (float | None): Tiempo máximo de búsqueda.
+
+    Yields:
+        Coincidencia: Con `inicio`/`fin` en caracteres desde el principio del archivo.
+
+    Raises:
+        TimeoutError: Si se supera `limite_segundos`.
+    """
+    tipos = _tipos_pedidos(tipos)
+    if not tipos:
+        return
+    for base, _, _, _, coincidencias in _recorrer_flujo(archivo, _patron_combinado(tipos), tam_bloque, solape, limite_segundos):
+        for m in coincidencias:
+            yield _coincidencia(m, base)
+
+
+# Busca patrones en un archivo por ruta sin leerlo entero (a diferencia de leer_archivo)
+def encontrar_patrones_archivo(ruta, tipos=None, tam_bloque=TAM_BLOQUE, solape=SOLAPE, limite_segundos=None):
+    """
+    Busca fechas, dinero y correos en un archivo de cualquier tamaño.
+
+    Args:
+        ruta (str): Ruta del archivo (UTF-8).
+        tipos (Iterable[str] | None): Subconjunto de `PATRONES`; todos si es `None`.
+        tam_bloque (int): Caracteres leídos en cada bloque.
+        solape (int): Longitud máxima de una coincidencia que cruza bloques.
+        limite_segundos (float | None): Tiempo máximo de búsqueda.
+
+    Yields:
+        Coincidencia: Con `inicio`/`fin` en caracteres desde el principio del archivo.
+
+    Raises:
+        TimeoutError: Si se supera `limite_segundos`.
+    """
+    # newline='' para que los offsets cuenten los \r\n tal cual están en el archivo
+    with open(ruta, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        yield from encontrar_patrones_flujo(f, tipos, tam_bloque, solape, limite_segundos)
+
+
+# Agrupa por tipo las coincidencias de una sola pasada
+def _buscar_patrones(texto, limite_segundos=None):
+    """
+    Extrae fechas, cantidades y correos recorriendo el texto una sola vez.
+
+    Args:
+        texto (str): Texto a analizar.
+        limite_segundos (float | None): Tiempo máximo de búsqueda (ver `encontrar_patrones`).
+
+    Returns:
+        dict: {'fechas': [...], 'dinero': [...], 'correos': [...]} más una
+        clave por cada patrón registrado. Si se supera el límite, las listas
+        quedan vacías y se añade 'error' con el motivo.
+    """
+    resultado = {tipo: [] for tipo in PATRONES}
+    try:
+        coincidencias = encontrar_patrones(texto, limite_segundos=limite_segundos)
+    except TimeoutError as e:
+        resultado["error"] = str(e)
+        return resultado
+    for coincidencia in coincidencias:
+        resultado[coincidencia.tipo].append(coincidencia.texto)
+    return resultado
+
+
+# ----------------------
+# Anonimización
+# ----------------------
+MODOS_ANONIMIZAR = ("mascara", "hash")
+# Etiqueta de cada tipo incluido en el texto anonimizado; los registrados usan su nombre en mayúsculas
+ETIQUETAS = {"fechas": "FECHA", "dinero": "DINERO", "correos": "CORREO"}
+
+
+# Texto que sustituye a una coincidencia
+def _sustituto(tipo, texto, modo, clave):
+    etiqueta = ETIQUETAS.get(tipo, tipo.upper())
+    if modo == "mascara":
+        return f"[{etiqueta}]"
+    resumen = hashlib.blake2b(texto.encode("utf-8"), digest_size=8, key=clave or b"").hexdigest()
+    return f"[{etiqueta}:{resumen}]"
+
+
+# Copia un flujo de texto a otro sustituyendo fechas, dinero y correos
+def anonimizar_flujo(entrada, salida, tipos=None, modo="mascara", clave=None,
+                     tam_bloque=TAM_BLOQUE, solape=SOLAPE):
+    """
+    Anonimiza un flujo de texto en una sola pasada y sin cargarlo entero.
+
+    Usa el mismo recorrido por bloques que `encontrar_patrones_flujo`: cada
+    tramo resuelto se escribe en `salida` en cuanto se conoce, con las
+    coincidencias ya sustituidas, así que nunca se construye una copia del
+    texto completo.
+
+    Args:
+        entrada: Objeto de texto con `read(n)`.
+        salida: Objeto de texto con `write(s)`.
+        tipos (Iterable[str] | None): Subconjunto de `PATRONES`; todos si es `None`.
+        modo (str): 'mascara' escribe "[CORREO]", "[FECHA]"...; 'hash' escribe
+            "[CORREO:<hash>]", igual para el mismo valor, de modo que se pueden
+            seguir contando o cruzando valores sin conocerlos.
+        clave (bytes | None): Clave del hash (blake2b). Sin clave, quien
+            conozca un correo puede calcular su hash y reconocerlo.
+        tam_bloque (int): Caracteres leídos en cada bloque.
+        solape (int): Longitud máxima de una coincidencia que cruza bloques.
+
+    Returns:
+        Counter: Número de sustituciones por tipo.
+    """
+    if modo not in MODOS_ANONIMIZAR:
+        raise ValueError(f"Modo desconocido: {modo!r}. Opciones: {', '.join(MODOS_ANONIMIZAR)}")
+    sustituciones = Counter()
+    tipos = _tipos_pedidos(tipos)
+    if not tipos:
+        while bloque := entrada.read(tam_bloque):
+            salida.write(bloque)
+        return sustituciones
+    for _, buffer, desde, hasta, coincidencias in _recorrer_flujo(entrada, _patron_combinado(tipos), tam_bloque, solape):
+        piezas = []
+        for m in coincidencias:
+            # PATRON_DINERO puede incluir el espacio de delante y PATRON_EMAIL signos . % + -;
+            # esos caracteres no forman parte del valor y se conservan
+            coincidencia = _coincidencia(m)
+            valor = coincidencia.texto.strip()
+            inicio = coincidencia.inicio + coincidencia.texto.index(valor)
+            piezas.append(buffer[desde:inicio])
+            piezas.append(_sustituto(coincidencia.tipo, valor, modo, clave))
+            sustituciones[coincidencia.tipo] += 1
+            desde = inicio + len(valor)
+        piezas.append(buffer[desde:hasta])
+        salida.write("".join(piezas))
+    return sustituciones
+
+
+# Versión para textos ya cargados en memoria
+def anonimizar(texto, tipos=None, modo="mascara", clave=None):
+    """
+    Sustituye fechas, dinero y correos de un texto (ver `anonimizar_flujo`).
+
+    Args:
+        texto (str): Texto a anonimizar.
+        tipos (Iterable[str] | None): Subconjunto de `PATRONES`; todos si es `None`.
+        modo (str): 'mascara' o 'hash'.
+        clave (bytes | None): Clave del hash en modo 'hash'.
+
+    Returns:
+        str: Texto anonimizado.
+    """
+    salida = io.StringIO()
+    anonimizar_flujo(io.StringIO(texto), salida, tipos, modo, clave)
+    return salida.getvalue()
+
+
+# ----------------------
+# Interpretación de coincidencias
+# ----------------------
+_RE_IMPORTE = re.compile(r"\d[\d.,]*")
+
+
+# Convierte una cantidad encontrada por PATRON_DINERO en (importe, moneda)
+def parsear_dinero(texto):
+    """
+    Interpreta una cantidad como las que devuelve `encontrar_dinero`.
+
+    Si aparecen '.' y ',' el último es el separador decimal. Si solo aparece
+    uno, es de miles cuando se repite o cuando le siguen exactamente tres
+    dígitos ("1.500€" son 1500); si no, es decimal ("30,5 €"). Con parte
+    entera 0 no puede ser de miles: "0,999 €" son 0.999.
+
+    Args:
+        texto (str): Cantidad, p. ej. "1.500,25 €" o "$30.99".
+
+    Returns:
+        tuple[Decimal, str] | None: Importe y código de moneda ('EUR' o 'USD'),
+        o `None` si no se reconoce.
+    """
+    if "€" in texto or "euros" in texto:
+        moneda = "EUR"
+    elif "$" in texto or "USD" in texto:
+        moneda = "USD"
+    else:
+        return None
+    m = _RE_IMPORTE.search(texto)
+    if m is None:
+        return None
+    numero = m.group().rstrip(".,")
+    separadores = [c for c in numero if c in ".,"]
+    if separadores:
+        decimal = separadores[-1]
+        entero = numero[:numero.rfind(decimal)]
+        if len(set(separadores)) == 1 and (len(separadores) > 1 or
+                                           (len(numero) - len(entero) == 4 and entero.strip("0"))):
+            decimal = None
+        if decimal is None:
+            numero = numero.replace(separadores[0], "")
+        else:
+            entero, _, fraccion = numero.rpartition(decimal)
+            numero = entero.replace(".", "").replace(",", "") + "." + fraccion
+    return Decimal(numero), moneda
+
+
+# Convierte una fecha encontrada por PATRON_FECHAS a formato ISO
+def parsear_fecha(texto):
+    """
+    Interpreta una fecha como las que devuelve `encontrar_fechas`.
+
+    "AAAA-MM-DD" se lee como año-mes-día y el resto como día/mes/año. Los
+    años de dos cifras siguen el criterio de `strptime` (%y): 69-99 son
+    1969-1999 y 00-68 son 2000-2068.
+
+    Args:
+        texto (str): Fecha, p. ej. "15/03/1995" o "2024-01-05".
+
+    Returns:
+        str | None: Fecha en formato 'AAAA-MM-DD', o `None` si no existe
+        (p. ej. "31/02/2024").
+    """
+    fecha = _interpretar_fecha(texto)
+    return fecha.isoformat() if fecha is not None else None
+
+
+# Fecha (datetime.date) de una coincidencia de PATRON_FECHAS, o None si no existe
+@lru_cache(maxsize=1 << 14)
+def _interpretar_fecha(texto):
+    partes = re.split(r"[/-]", texto)
+    if len(partes) != 3 or not all(p.isdigit() for p in partes):
+        return None
+    if len(partes[0]) == 4:
+        anio, mes, dia = partes
+    else:
+        dia, mes, anio = partes
+    anio = int(anio)
+    if len(partes[2]) == 2 and len(partes[0]) != 4:
+        anio += 1900 if anio >= 69 else 2000
+    try:
+        return date(anio, int(mes), int(dia))
+    except ValueError:
+        return None
+
+
+# ----------------------
+# Salida en columnas
+# ----------------------
+# Monedas que reconoce parsear_dinero; la columna `moneda` guarda su índice
+MONEDAS = ("EUR", "USD")
+_EPOCA = date(1970, 1, 1).toordinal()
+
+# Las mismas cantidades y fechas se repiten mucho en un corpus: se interpretan una vez
+_interpretar_dinero = lru_cache(maxsize=1 << 14)(parsear_dinero)
+
+
+# Rango de la columna `centimos` (array "q": entero con signo de 64 bits), simétrico para que abs() no desborde
+_MAX_CENTIMOS = (1 << 63) - 1
+_MIN_CENTIMOS = -_MAX_CENTIMOS
+
+
+class ColumnasPatrones:
+    """
+    Importes y fechas ya interpretados, guardados en columnas `array`.
+
+    Cada coincidencia ocupa una fila; las columnas de un mismo grupo tienen
+    la misma longitud. Los importes se guardan en céntimos (enteros de 64
+    bits), así que las sumas son exactas, y las fechas como días desde
+    1970-01-01. `a_numpy()` devuelve las columnas como arrays de NumPy sin
+    copiarlas, para filtrar y agregar millones de filas de golpe.
+
+    Columnas:
+    - dinero_documento, centimos, moneda (índice en `MONEDAS`)
+    - fechas_documento, dias
+    - no_interpretados (Counter): cantidades y fechas descartadas, por tipo
+      (también los importes que no caben en 64 bits).
+    """
+    # Constructor: columnas vacías
+    def __init__(self):
+        self.dinero_documento = array("q")
+        self.centimos = array("q")
+        self.moneda = array("B")
+        self.fechas_documento = array("q")
+        self.dias = array("q")
+        self.no_interpretados = Counter()
+
+    # Añade las fechas y cantidades (texto tal cual se encontró) de un documento
+    def agregar(self, documento, fechas=(), dinero=()):
+        for texto in dinero:
+            interpretada = _interpretar_dinero(texto)
+            if interpretada is None:
+                self.no_interpretados["dinero"] += 1
+                continue
+            importe, moneda = interpretada
+            centimos = int((importe * 100).to_integral_value())
+            if not _MIN_CENTIMOS <= centimos <= _MAX_CENTIMOS:
+                self.no_interpretados["dinero"] += 1
+                continue
+            self.dinero_documento.append(documento)
+            self.centimos.append(centimos)
+            self.moneda.append(MONEDAS.index(moneda))
+        for texto in fechas:
+            fecha = _interpretar_fecha(texto)
+            if fecha is None:
+                self.no_interpretados["fechas"] += 1
+                continue
+            self.fechas_documento.append(documento)
+            self.dias.append(fecha.toordinal() - _EPOCA)
+
+    # Suma exacta de importes por moneda
+    def total_por_moneda(self):
+        """
+        Returns:
+            dict[str, Decimal]: Total por código de moneda (solo las que aparecen).
+        """
+        np = _importar("numpy")
+        sumas = None
+        if np is not None and self.centimos:
+            centimos, moneda = np.frombuffer(self.centimos, np.int64), np.frombuffer(self.moneda, np.uint8)
+            # La suma en int64 de NumPy desborda sin avisar: con importes enormes se suma en Python
+            if len(centimos) * int(np.abs(centimos).max()) <= _MAX_CENTIMOS:
+                sumas = {i: int(centimos[moneda == i].sum()) for i in np.unique(moneda).tolist()}
+        if sumas is None:
+            sumas = {}
+            for c, i in zip(self.centimos, self.moneda):
+                sumas[i] = sumas.get(i, 0) + c
+        return {MONEDAS[i]: Decimal(total).scaleb(-2) for i, total in sorted(sumas.items())}
+
+    # Histograma de fechas por día ('AAAA-MM-DD'), mes ('AAAA-MM') o año ('AAAA')
+    def histograma_fechas(self, por="mes"):
+        """
+        Args:
+            por (str): 'dia', 'mes' o 'anio'.
+
+        Returns:
+            dict[str, int]: Número de fechas por periodo, en orden cronológico.
+        """
+        longitud = {"dia": 10, "mes": 7, "anio": 4}[por]
+        histograma = Counter()
+        # Counter sobre el array cuenta en C; después solo se convierten los días distintos
+        for dias, n in Counter(self.dias).items():
+            histograma[date.fromordinal(dias + _EPOCA).isoformat()[:longitud]] += n
+        return dict(sorted(histograma.items()))
+
+    # Vista NumPy de las columnas (requiere numpy)
+    def a_numpy(self):
+        """
+        Returns:
+            dict: Columnas como `numpy.ndarray` que comparten memoria con los
+            `array` (las fechas, como `datetime64[D]`).
+
+        Raises:
+            ImportError: Si NumPy no está instalado.
+        """
+        np = _importar("numpy")
+        if np is None:
+            raise ImportError("ColumnasPatrones.a_numpy necesita numpy (pip install numpy)")
+        return {
+            "dinero_documento": np.frombuffer(self.dinero_documento, np.int64),
+            "centimos": np.frombuffer(self.centimos, np.int64),
+            "moneda": np.frombuffer(self.moneda, np.uint8),
+            "fechas_documento": np.frombuffer(self.fechas_documento, np.int64),
+            "dias": np.frombuffer(self.dias, np.int64).view("datetime64[D]"),
+        }
+
+
+# Extrae importes y fechas de un corpus directamente en columnas
+def columnas_patrones(textos):
+    """
+    Busca e interpreta dinero y fechas en una colección de textos.
+
+    Args:
+        textos (Iterable[str]): Documentos; el índice de cada uno va en las
+            columnas `*_documento`.
+
+    Returns:
+        ColumnasPatrones: Columnas con una fila por coincidencia interpretada.
+    """
+    columnas = ColumnasPatrones()
+    for documento, texto in enumerate(textos):
+        # Dos regex por separado: sin offsets no hace falta la alternancia combinada, que es más lenta
+        texto = texto or ""
+        columnas.agregar(documento, encontrar_fechas(texto), encontrar_dinero(texto))
+    return columnas
+
+# ----------------------
+# Reescaneo incremental
+# ----------------------
+class EscanerIncremental:
+    """
+    Búsqueda de patrones que solo reescanea los bloques de texto que cambian.
+
+    El texto se divide en bloques de líneas y las coincidencias de cada
+    bloque se guardan con su hash de contenido como clave. Al volver a
+    escanear tras una edición, los bloques sin cambios se sirven desde la
+    caché y solo se pasa el regex por los modificados.
+
+    Los cortes entre bloques dependen del contenido (una línea en blanco o
+    una línea cuyo hash es múltiplo de `lineas_por_bloque`), no de la
+    posición: insertar o borrar una línea solo cambia su bloque y no
+    desplaza los cortes de todo lo que viene detrás.
+
+    Una coincidencia que cruce el corte entre dos bloques (p. ej. un
+    importe partido por un salto de línea) no se detecta.
+
+    Atributos:
+    - reescaneados (int): bloques procesados con el regex en el último escaneo.
+    - reutilizados (int): bloques servidos desde la caché en el último escaneo.
+    """
+    # Constructor: tamaño medio de bloque en líneas y tipos a buscar
+    def __init__(self, lineas_por_bloque=32, tipos=None):
+        self.lineas_por_bloque = lineas_por_bloque
+        self.tipos = tipos
+        self.reescaneados = 0
+        self.reutilizados = 0
+        self._cache = {}
+        self._patrones = dict(PATRONES)
+
+    # Divide el texto en bloques con cortes definidos por el contenido
+    def _bloques(self, texto):
+        bloque = []
+        for linea in texto.splitlines(keepends=True):
+            bloque.append(linea)
+            if not linea.strip() or hash(linea) % self.lineas_por_bloque == 0:
+                yield "".join(bloque)
+                bloque = []
+        if bloque:
+            yield "".join(bloque)
+
+    # Escanea el texto reutilizando las coincidencias de los bloques que no han cambiado
+    def escanear(self, texto):
+        """
+        Devuelve las coincidencias de `texto`, como `encontrar_patrones`.
+
+        Args:
+            texto (str): Texto completo tras la edición.
+
+        Returns:
+            list[Coincidencia]: Coincidencias con offsets relativos a `texto`.
+        """
+        # Si se han registrado o eliminado patrones, la caché ya no vale
+        if self._patrones != PATRONES:
+            self._cache.clear()
+            self._patrones = dict(PATRONES)
+        cache_nueva = {}
+        resultado = []
+        desplazamiento = 0
+        self.reescaneados = self.reutilizados = 0
+        for bloque in self._bloques(texto):
+            clave = hashlib.blake2b(bloque.encode('utf-8'), digest_size=16).digest()
+            coincidencias = cache_nueva.get(clave)
+            if coincidencias is None:
+                coincidencias = self._cache.get(clave)
+            if coincidencias is None:
+                coincidencias = encontrar_patrones(bloque, self.tipos)
+                self.reescaneados += 1
+            else:
+                self.reutilizados += 1
+            cache_nueva[clave] = coincidencias
+            resultado.extend(c._replace(inicio=c.inicio + desplazamiento, fin=c.fin + desplazamiento)
+                             for c in coincidencias)
+            desplazamiento += len(bloque)
+        # Solo se conservan los bloques del texto actual: la caché no crece sin límite
+        self._cache = cache_nueva
+        return resultado
+
+
 # ----------------------
 # Resumen simple
 # ----------------------
@@ -333,14 +2125,20 @@ def resumen_simple(texto, n=3, nlp=None):
     """
     if not texto or not texto.strip():
         return "Error: texto vacío."
-    oraciones = list(nlp(texto).sents) if nlp else [s.strip() for s in texto.split('.') if s.strip()]
+    doc = procesar_doc(texto, nlp, "resumen") if nlp else None
+    return _resumir(texto, n, doc)
+
+
+# Cuerpo del resumen: con Doc usa sus oraciones y POS, sin Doc parte por puntos
+def _resumir(texto, n, doc):
+    oraciones = list(doc.sents) if doc is not None else [s.strip() for s in texto.split('.') if s.strip()]
     if len(oraciones) <= n:
         return texto
     puntuaciones = []
     for i, oracion in enumerate(oraciones):
         puntaje = 0
-        tokens = oracion if nlp else re.findall(r"\w+", oracion)
-        if nlp:
+        tokens = oracion if doc is not None else re.findall(r"\w+", oracion)
+        if doc is not None:
             sustantivos = [t for t in oracion if t.pos_ == "NOUN"]
             puntaje += len(sustantivos)
             longitud = len(oracion.text)
@@ -354,7 +2152,7 @@ def resumen_simple(texto, n=3, nlp=None):
         puntuaciones.append((i, puntaje))
     mejores = sorted(puntuaciones, key=lambda x: x[1], reverse=True)[:n]
     indices = sorted([idx for idx, _ in mejores])
-    return " ".join(oraciones[i].text.strip() if nlp else oraciones[i] for i in indices)
+    return " ".join(oraciones[i].text.strip() if doc is not None else oraciones[i] for i in indices)
 
 
 # ----------------------
@@ -375,7 +2173,11 @@ def extraer_entidades(texto, nlp):
     if nlp is None:
         print("Aviso: spaCy no disponible — NER no puede ejecutarse.")
         return {}
-    doc = nlp(texto)
+    return _entidades(procesar_doc(texto, nlp, "entidades"))
+
+
+# Agrupa las entidades de un Doc por categoría
+def _entidades(doc):
     def extraer(tipo): return [ent.text for ent in doc.ents if ent.label_ == tipo]
     return {
         'Personas': sorted(set(extraer('PER'))),
@@ -390,7 +2192,7 @@ def extraer_entidades(texto, nlp):
 # Palabras clave - Marius
 # ----------------------
 # Extrae palabras clave usando nltk para filtrar stopwords y spaCy para sustantivos y verbos
-def extraer_palabras_clave(texto, nlp=None):
+def extraer_palabras_clave(texto, nlp=None, rapido=False):
     """
         Extrae palabras clave relevantes de un texto en español.
 
@@ -404,6 +2206,8 @@ def extraer_palabras_clave(texto, nlp=None):
         Parámetros:
         - texto (str): texto de entrada. Si está vacío, devuelve `None`.
         - nlp (spaCy Language, opcional): objeto spaCy para análisis morfosintáctico.
+        - rapido (bool): tomar las categorías de `cache_lemas` cuando todas
+            las palabras ya se han visto (ver `procesar_doc_lemas`).
 
         Retorna:
         dict con claves:
@@ -417,18 +2221,27 @@ def extraer_palabras_clave(texto, nlp=None):
         """
     if not texto or not texto.strip():
         return None
+    if not nlp:
+        return _palabras_clave(texto, None)
+    return _palabras_clave(texto, *procesar_doc_lemas(texto, nlp, "palabras_clave", rapido))
+
+
+# Cuerpo de palabras clave: NLTK sobre el texto y POS de spaCy sobre el Doc (o de `valores` en modo rápido)
+def _palabras_clave(texto, doc, valores=None):
     tokens_filtrados, sustantivos_relevantes, verbos_principales = [], [], []
-    if nltk:
+    if _importar("nltk"):
+        from nltk.corpus import stopwords
+        from nltk.tokenize import word_tokenize
         tokens = word_tokenize(texto.lower())
         stopwords_es = set(stopwords.words('spanish'))
         tokens_filtrados = [t for t in tokens if t.isalnum() and t not in stopwords_es and len(t) > 2]
         top_5 = Counter(tokens_filtrados).most_common(5)
     else:
         top_5 = []
-    if nlp:
-        doc = nlp(texto)
-        sustantivos_relevantes = Counter([t.text for t in doc if t.pos_ == 'NOUN']).most_common(5)
-        verbos_principales = Counter([t.text for t in doc if t.pos_ == 'VERB']).most_common(5)
+    if doc is not None:
+        categorias = [t.pos_ for t in doc] if valores is None else [v[1] for v in valores]
+        sustantivos_relevantes = Counter([t.text for t, pos in zip(doc, categorias) if pos == 'NOUN']).most_common(5)
+        verbos_principales = Counter([t.text for t, pos in zip(doc, categorias) if pos == 'VERB']).most_common(5)
     return {
         'top_5_palabras': top_5, 
         'sustantivos': sustantivos_relevantes, 
@@ -444,6 +2257,10 @@ def sentimiento_es(texto, clasificador):
     """
     Analiza el sentimiento usando el modelo multilingual-uncased de Nlptown.
 
+    Los textos que superan el límite de 512 tokens del modelo se dividen en
+    ventanas, se clasifican en un único lote y se combinan ponderando cada
+    ventana por su longitud.
+
     Retorna:
         - sentimiento: "Positivo", "Negativo", "Neutral" o "Error"
         - score: confianza (0–1)
@@ -455,15 +2272,411 @@ def sentimiento_es(texto, clasificador):
     if clasificador is None:
         return "Error: transformers no instalado.", 0.0, "transformers missing"
     try:
-        resultado = clasificador(texto)[0]
-        etiqueta = resultado.get('label', '')
-        puntuacion = resultado.get('score', 0.0)
-        if "1" in etiqueta or "2" in etiqueta:
-            sentimiento = "Negativo"
-        elif "3" in etiqueta:
-            sentimiento = "Neutral"
-        else:
-            sentimiento = "Positivo"
-        return sentimiento, puntuacion, etiqueta
+        ventanas = _ventanas_sentimiento(texto, clasificador)
+        if len(ventanas) == 1:
+            # truncation: la estimación sin tokenizer rápido (2 tokens por palabra) puede quedarse corta
+            return _interpretar_sentimiento(clasificador(texto, truncation=True)[0])
+        # Texto largo: todas las ventanas van al modelo en un único lote
+        salidas = clasificador(ventanas, batch_size=len(ventanas), truncation=True)
+        return _interpretar_sentimiento(_agregar_ventanas(ventanas, salidas))
     except Exception as e:
         return "Error", 0.0, str(e)
+
+
+# Límite de tokens del modelo BERT de sentimiento (incluye [CLS] y [SEP])
+MAX_TOKENS_SENTIMIENTO = 512
+
+
+# Divide un texto en ventanas que caben en el modelo; un texto corto devuelve [texto]
+def _ventanas_sentimiento(texto, clasificador, max_tokens=MAX_TOKENS_SENTIMIENTO):
+    """
+    Parte `texto` en fragmentos de como mucho `max_tokens - 2` tokens.
+
+    Con un tokenizer rápido de HuggingFace se usan sus offsets para cortar
+    exactamente por tokens. Sin tokenizer (o con uno lento) se corta por
+    palabras con un margen conservador de dos tokens por palabra.
+    """
+    presupuesto = max_tokens - 2
+    # Cada token ocupa al menos un carácter: un texto corto nunca supera el límite
+    if len(texto) <= presupuesto:
+        return [texto]
+    tokenizer = getattr(clasificador, "tokenizer", None)
+    if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+        offsets = tokenizer(texto, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+        if len(offsets) <= presupuesto:
+            return [texto]
+        return [texto[offsets[i][0]:offsets[min(i + presupuesto, len(offsets)) - 1][1]]
+                for i in range(0, len(offsets), presupuesto)]
+    palabras = [m.span() for m in re.finditer(r"\S+", texto)]
+    por_ventana = max(1, presupuesto // 2)
+    if len(palabras) <= por_ventana:
+        return [texto]
+    return [texto[palabras[i][0]:palabras[min(i + por_ventana, len(palabras)) - 1][1]]
+            for i in range(0, len(palabras), por_ventana)]
+
+
+# Combina las salidas de varias ventanas ponderando cada una por su longitud
+def _agregar_ventanas(ventanas, salidas):
+    """
+    Agrega las predicciones de las ventanas de un texto largo.
+
+    Cada ventana vota por su etiqueta con peso `longitud * score`; gana la
+    etiqueta con más peso y su score es la fracción del peso total que
+    reúne. Devuelve un dict con la misma forma que la salida del modelo.
+    """
+    pesos = Counter()
+    for ventana, salida in zip(ventanas, salidas):
+        pesos[salida.get('label', '')] += len(ventana) * salida.get('score', 0.0)
+    total = sum(len(ventana) for ventana in ventanas)
+    etiqueta, peso = pesos.most_common(1)[0]
+    return {'label': etiqueta, 'score': peso / total if total else 0.0}
+
+
+# Traduce la salida del modelo ({'label': '4 stars', 'score': ...}) a (sentimiento, score, etiqueta)
+def _interpretar_sentimiento(resultado):
+    etiqueta = resultado.get('label', '')
+    puntuacion = resultado.get('score', 0.0)
+    if "1" in etiqueta or "2" in etiqueta:
+        sentimiento = "Negativo"
+    elif "3" in etiqueta:
+        sentimiento = "Neutral"
+    else:
+        sentimiento = "Positivo"
+    return sentimiento, puntuacion, etiqueta
+
+
+# Tamaño de lote por defecto para el modelo de sentimiento
+TAM_LOTE_SENTIMIENTO = 16
+
+
+# Clasifica una lista de textos no vacíos ordenándolos por longitud para minimizar el padding.
+# Los textos largos se parten en ventanas que viajan en los mismos lotes y luego se agregan.
+# Un texto cuyo troceado falla recibe su tupla de error y el resto del lote sigue adelante.
+def _clasificar_lotes(textos, clasificador, batch_size):
+    ventanas = []
+    errores = {}
+    for i, texto in enumerate(textos):
+        try:
+            ventanas.append(_ventanas_sentimiento(texto, clasificador))
+        except Exception as e:
+            ventanas.append([])
+            errores[i] = ("Error", 0.0, str(e))
+    piezas = [(i, ventana) for i, partes in enumerate(ventanas) for ventana in partes]
+    salidas = [None] * len(piezas)
+    orden = sorted(range(len(piezas)), key=lambda p: len(piezas[p][1]))
+    for inicio in range(0, len(orden), batch_size):
+        indices = orden[inicio:inicio + batch_size]
+        try:
+            for p, salida in zip(indices, clasificador([piezas[p][1] for p in indices], batch_size=len(indices), truncation=True)):
+                salidas[p] = salida
+        except Exception as e:
+            for p in indices:
+                errores[piezas[p][0]] = ("Error", 0.0, str(e))
+    resultados = []
+    p = 0
+    for i, partes in enumerate(ventanas):
+        propias = salidas[p:p + len(partes)]
+        p += len(partes)
+        if i in errores:
+            resultados.append(errores[i])
+        elif len(partes) == 1:
+            resultados.append(_interpretar_sentimiento(propias[0]))
+        else:
+            resultados.append(_interpretar_sentimiento(_agregar_ventanas(partes, propias)))
+    return resultados
+
+
+# Versión por lotes de sentimiento_es
+def sentimiento_es_lote(textos, clasificador, batch_size=TAM_LOTE_SENTIMIENTO):
+    """
+    Analiza el sentimiento de un iterable de textos en lotes.
+
+    Los textos se leen en ventanas de `batch_size * 32`; dentro de cada
+    ventana se ordenan por longitud antes de formar los lotes, de modo que
+    cada lote mezcla textos de tamaño parecido y el padding es mínimo.
+
+    Args:
+        textos (Iterable[str]): Textos a analizar.
+        clasificador: Pipeline de sentimiento (ver `inicializar_sentimiento`).
+        batch_size (int): Textos por llamada al modelo.
+
+    Yields:
+        tuple: (sentimiento, score, etiqueta) como `sentimiento_es`, en el orden de entrada.
+    """
+    iterador = iter(textos)
+    while True:
+        ventana = list(itertools.islice(iterador, batch_size * 32))
+        if not ventana:
+            return
+        validos = [i for i, texto in enumerate(ventana) if texto and texto.strip()]
+        clasificados = {}
+        if clasificador is not None and validos:
+            clasificados = dict(zip(validos, _clasificar_lotes([ventana[i] for i in validos], clasificador, batch_size)))
+        for i, texto in enumerate(ventana):
+            yield clasificados[i] if i in clasificados else sentimiento_es(texto, clasificador)
+
+
+class AgrupadorSentimiento:
+    """
+    Agrupa peticiones de sentimiento de varios hilos en lotes dinámicos.
+
+    Un hilo de fondo espera la primera petición y sigue recogiendo durante
+    como mucho `espera_ms` milisegundos (o hasta llenar `batch_size`);
+    después ordena el lote por longitud y lo envía al modelo en una sola
+    llamada. Cada petición recibe su resultado a través de un `Future`.
+
+    Uso:
+        >>> with AgrupadorSentimiento(clasificador) as agrupador:
+        ...     futuro = agrupador.enviar("Me encanta este producto")
+        ...     sentimiento, score, etiqueta = futuro.result()
+    """
+    # Constructor: arranca el hilo que forma y procesa los lotes
+    def __init__(self, clasificador, batch_size=TAM_LOTE_SENTIMIENTO, espera_ms=5):
+        self.clasificador = clasificador
+        self.batch_size = batch_size
+        self.espera_ms = espera_ms
+        self._cola = queue.Queue()
+        self._lock = threading.Lock()
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._bucle, name="AgrupadorSentimiento", daemon=True)
+        self._hilo.start()
+
+    # Encola un texto y devuelve un Future con (sentimiento, score, etiqueta)
+    def enviar(self, texto):
+        """
+        Raises:
+            RuntimeError: Si el agrupador ya se ha cerrado.
+        """
+        futuro = Future()
+        with self._lock:
+            if self._cerrado:
+                raise RuntimeError("AgrupadorSentimiento cerrado: no admite más peticiones")
+            if not texto or not texto.strip() or self.clasificador is None:
+                futuro.set_result(sentimiento_es(texto, self.clasificador))
+            else:
+                self._cola.put((texto, futuro))
+        return futuro
+
+    # Bucle del hilo: recoge peticiones hasta llenar el lote o agotar la espera
+    def _bucle(self):
+        while True:
+            primera = self._cola.get()
+            if primera is None:
+                return
+            lote = [primera]
+            limite = time.perf_counter() + self.espera_ms / 1000
+            cerrar = False
+            while len(lote) < self.batch_size:
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    break
+                try:
+                    peticion = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if peticion is None:
+                    cerrar = True
+                    break
+                lote.append(peticion)
+            try:
+                resultados = _clasificar_lotes([texto for texto, _ in lote], self.clasificador, self.batch_size)
+            except Exception as e:
+                # El fallo se entrega a cada petición del lote; el hilo sigue atendiendo la cola
+                for _, futuro in lote:
+                    futuro.set_exception(e)
+            else:
+                for (_, futuro), resultado in zip(lote, resultados):
+                    futuro.set_result(resultado)
+            if cerrar:
+                return
+
+    # Procesa lo pendiente y detiene el hilo; llamarlo más de una vez no tiene efecto
+    def cerrar(self):
+        with self._lock:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            self._cola.put(None)
+        self._hilo.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# ----------------------
+# Análisis completo
+# ----------------------
+# Ejecuta los seis análisis sobre un texto parseándolo una sola vez y midiendo cada etapa
+def analizar_todo(texto, nlp=None, clasificador=None, n_resumen=3, limite_patrones=None):
+    """
+    Ejecuta todos los análisis de wordChef sobre un mismo texto en una pasada.
+
+    El texto se procesa con spaCy una única vez (a través de la caché de
+    documentos) y ese `Doc` se reutiliza para normalización, resumen, NER y
+    palabras clave. Los tres patrones regex se buscan en un solo recorrido.
+
+    Args:
+        texto (str): Texto a analizar.
+        nlp: Pipeline spaCy opcional.
+        clasificador: Pipeline de sentimiento opcional (ver `inicializar_sentimiento`).
+        n_resumen (int): Número máximo de oraciones del resumen.
+        limite_patrones (float | None): Tiempo máximo de la búsqueda de patrones;
+            si se supera, 'patrones' lleva 'error' (ver `_buscar_patrones`).
+
+    Returns:
+        dict | None: Claves 'normalizacion', 'patrones', 'resumen', 'entidades',
+        'palabras_clave', 'sentimiento' y 'tiempos' (segundos por etapa).
+        Devuelve `None` si el texto está vacío.
+    """
+    if not texto or not texto.strip():
+        return None
+    inicio = time.perf_counter()
+    doc = procesar_doc(texto, nlp) if nlp else None
+    return _analizar(texto, doc, clasificador, n_resumen, {"parseo": time.perf_counter() - inicio} if nlp else {},
+                     limite_patrones)
+
+
+# Cuerpo de analizar_todo sobre un Doc ya procesado; `tiempos` trae el coste del parseo
+def _analizar(texto, doc, clasificador, n_resumen, tiempos, limite_patrones=None):
+    # Mide una etapa y guarda su duración en `tiempos`
+    def medir(etapa, funcion, *args):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        tiempos[etapa] = time.perf_counter() - inicio
+        return resultado
+
+    resultado = {
+        "normalizacion": medir("normalizacion", _normalizar, texto, doc),
+        "patrones": medir("patrones", _buscar_patrones, texto, limite_patrones),
+        "resumen": medir("resumen", _resumir, texto, n_resumen, doc),
+        "entidades": medir("entidades", _entidades, doc) if doc is not None else {},
+        "palabras_clave": medir("palabras_clave", _palabras_clave, texto, doc),
+    }
+    sentimiento, score, etiqueta = medir("sentimiento", sentimiento_es, texto, clasificador)
+    resultado["sentimiento"] = {"sentimiento": sentimiento, "score": score, "etiqueta": etiqueta}
+    tiempos["total"] = sum(tiempos.values())
+    resultado["tiempos"] = tiempos
+    return resultado
+
+
+# ----------------------
+# Procesamiento por lotes
+# ----------------------
+# Tamaño de lote por defecto para nlp.pipe
+TAM_LOTE = 64
+
+
+# Recorre los textos en orden junto a su Doc, procesados en lotes con nlp.pipe
+def _docs_lote(textos, nlp, batch_size, tarea=None):
+    """
+    Genera pares (texto, doc) en el orden de entrada usando `nlp.pipe`.
+
+    Los documentos no pasan por la caché compartida: en un corpus grande
+    cada texto se ve una sola vez y guardarlos solo gastaría memoria.
+    Con `tarea` se desactivan los componentes que esa tarea no necesita.
+    Si `nlp` es `None` se devuelve `doc=None` para que cada analizador
+    use su fallback sin spaCy.
+    """
+    if nlp is None:
+        for texto in textos:
+            yield texto, None
+        return
+    entradas = ((texto or "", texto) for texto in textos)
+    desactivados = componentes_desactivados(nlp, tarea)
+    for doc, texto in nlp.pipe(entradas, as_tuples=True, batch_size=batch_size, disable=desactivados):
+        yield texto, doc
+
+
+# Versión por lotes de normalizador_texto
+def normalizador_texto_lote(textos, nlp, batch_size=TAM_LOTE):
+    """
+    Normaliza un iterable de textos procesándolos en lotes con `nlp.pipe`.
+
+    Args:
+        textos (Iterable[str]): Textos a normalizar (se consumen de forma perezosa).
+        nlp: Pipeline spaCy (o `None` para el fallback sin spaCy).
+        batch_size (int): Textos por lote enviados a spaCy.
+
+    Yields:
+        dict | None: Mismo resultado que `normalizador_texto`, en el orden de entrada.
+    """
+    for texto, doc in _docs_lote(textos, nlp, batch_size, "normalizar"):
+        yield _normalizar(texto, doc) if texto and texto.strip() else None
+
+
+# Versión por lotes de resumen_simple
+def resumen_simple_lote(textos, n=3, nlp=None, batch_size=TAM_LOTE):
+    """
+    Resume un iterable de textos procesándolos en lotes con `nlp.pipe`.
+
+    Args:
+        textos (Iterable[str]): Textos a resumir.
+        n (int): Número máximo de oraciones por resumen.
+        nlp: Pipeline spaCy opcional.
+        batch_size (int): Textos por lote enviados a spaCy.
+
+    Yields:
+        str: Mismo resultado que `resumen_simple`, en el orden de entrada.
+    """
+    for texto, doc in _docs_lote(textos, nlp, batch_size, "resumen"):
+        yield _resumir(texto, n, doc) if texto and texto.strip() else "Error: texto vacío."
+
+
+# Versión por lotes de extraer_entidades
+def extraer_entidades_lote(textos, nlp, batch_size=TAM_LOTE):
+    """
+    Extrae entidades de un iterable de textos procesándolos en lotes con `nlp.pipe`.
+
+    Args:
+        textos (Iterable[str]): Textos a analizar.
+        nlp: Pipeline spaCy.
+        batch_size (int): Textos por lote enviados a spaCy.
+
+    Yields:
+        dict: Mismo resultado que `extraer_entidades`, en el orden de entrada.
+    """
+    if nlp is None:
+        print("Aviso: spaCy no disponible — NER no puede ejecutarse.")
+    for _, doc in _docs_lote(textos, nlp, batch_size, "entidades"):
+        yield _entidades(doc) if doc is not None else {}
+
+
+# Versión por lotes de extraer_palabras_clave
+def extraer_palabras_clave_lote(textos, nlp=None, batch_size=TAM_LOTE):
+    """
+    Extrae palabras clave de un iterable de textos procesándolos en lotes con `nlp.pipe`.
+
+    Args:
+        textos (Iterable[str]): Textos a analizar.
+        nlp: Pipeline spaCy opcional.
+        batch_size (int): Textos por lote enviados a spaCy.
+
+    Yields:
+        dict | None: Mismo resultado que `extraer_palabras_clave`, en el orden de entrada.
+    """
+    for texto, doc in _docs_lote(textos, nlp, batch_size, "palabras_clave"):
+        yield _palabras_clave(texto, doc) if texto and texto.strip() else None
+
+
+# Versión por lotes de analizar_todo
+def analizar_todo_lote(textos, nlp=None, clasificador=None, n_resumen=3, batch_size=TAM_LOTE, limite_patrones=None):
+    """
+    Ejecuta `analizar_todo` sobre un iterable de textos con parseo por lotes.
+
+    Args:
+        textos (Iterable[str]): Textos a analizar.
+        nlp: Pipeline spaCy opcional.
+        clasificador: Pipeline de sentimiento opcional.
+        n_resumen (int): Número máximo de oraciones del resumen.
+        batch_size (int): Textos por lote enviados a spaCy.
+        limite_patrones (float | None): Tiempo máximo de la búsqueda de patrones por texto.
+
+    Yields:
+        dict | None: Mismo resultado que `analizar_todo` (sin la etapa 'parseo',
+        que se reparte entre los textos del lote), en el orden de entrada.
+    """
+    for texto, doc in _docs_lote(textos, nlp, batch_size):
+        yield _analizar(texto, doc, clasificador, n_resumen, {}, limite_patrones) if texto and texto.strip() else None
@@ -0,0 +1,42 @@
+"""
+Anonimiza archivos de log antes de analizarlos: sustituye fechas, dinero y
+correos en una sola pasada y en streaming (ver `wordChef.anonimizar_flujo`).
+
+Uso:
+    python wordChef_anonimizar.py app.log -o app.anon.log
+    cat app.log | python wordChef_anonimizar.py --modo hash --clave-env ANON_CLAVE > app.anon.log
+"""
+
+import os
+import sys
+import json
+import argparse
+
+import wordChef
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Anonimiza fechas, dinero y correos de un texto.")
+    parser.add_argument("entrada", nargs="?", help="Archivo de entrada (por defecto, la entrada estándar)")
+    parser.add_argument("-o", "--salida", help="Archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("--modo", choices=wordChef.MODOS_ANONIMIZAR, default="mascara")
+    parser.add_argument("--tipo", action="append", help="Tipo de patrón a anonimizar (por defecto, todos)")
+    parser.add_argument("--clave-env", help="Variable de entorno con la clave del hash en modo hash")
+    args = parser.parse_args(argv)
+
+    clave = os.environ[args.clave_env].encode("utf-8") if args.clave_env else None
+    # newline='' en ambos lados para que los saltos de línea salgan tal cual entraron
+    entrada = open(args.entrada, 'r', encoding='utf-8', errors='replace', newline='') if args.entrada else sys.stdin
+    salida = open(args.salida, 'w', encoding='utf-8', newline='') if args.salida else sys.stdout
+    try:
+        sustituciones = wordChef.anonimizar_flujo(entrada, salida, args.tipo, args.modo, clave)
+    finally:
+        if args.entrada:
+            entrada.close()
+        if args.salida:
+            salida.close()
+    sys.stderr.write(json.dumps({"sustituciones": dict(sustituciones)}, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
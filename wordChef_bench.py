@@ -0,0 +1,445 @@
+"""
+Benchmarks reproducibles de wordChef.
+
+Los textos se generan con un generador sintético determinista (misma
+semilla, mismo corpus), así que los resultados son comparables entre
+ejecuciones y entre versiones de los patrones. Cada benchmark imprime
+un objeto JSON por línea.
+
+Uso:
+    python wordChef_bench.py suite [--grande] [--referencia anterior.jsonl]
+    python wordChef_bench.py rendimiento [--grande] [--semilla 42]
+    python wordChef_bench.py densidades [--tamano 1048576] [--semilla 42]
+    python wordChef_bench.py prefiltros [--docs 20000] [--semilla 42]
+    python wordChef_bench.py adversarial [--tam-base 20000] [--duplicaciones 3]
+    python wordChef_bench.py normalizador [--tamano 1048576] [--semilla 42]
+
+Para detectar regresiones se guarda la salida de una versión
+(`... suite > antes.jsonl`) y se pasa como `--referencia` al medir la
+siguiente: cada resultado incluye entonces `relativo` (MB/s nuevos entre
+MB/s de referencia) y `regresion` si cae por debajo de la tolerancia.
+"""
+
+import sys
+import json
+import math
+import platform
+import time
+import random
+import argparse
+
+import wordChef
+
+
+# ----------------------
+# Generador de corpus sintético
+# ----------------------
+# Frases de relleno con el estilo de tickets de soporte en español
+FRASES = [
+    "El cliente indica que la aplicación no carga desde ayer por la tarde.",
+    "Se ha reiniciado el servidor pero el problema continúa.",
+    "Solicita que le llamemos lo antes posible para revisar la incidencia.",
+    "La factura del mes pasado aparece duplicada en su cuenta.",
+    "No puede acceder al panel con su usuario habitual.",
+    "Adjunta capturas de pantalla del error que recibe al guardar.",
+    "Pide la baja del servicio y la devolución del último cargo.",
+    "El pedido llegó incompleto y falta una de las cajas.",
+    "Comenta que la atención recibida fue muy buena y rápida.",
+    "Queda pendiente de confirmar la dirección de envío.",
+]
+NOMBRES = ["juan", "maria", "lucia", "pablo", "sergio", "ana", "carmen", "diego"]
+DOMINIOS = ["ejemplo.com", "correo.es", "empresa.org", "soporte.net"]
+
+# Densidades por defecto (probabilidad de que un documento contenga cada patrón),
+# parecidas a las de un volcado real de tickets: la mayoría no tiene ninguno
+DENSIDADES = {"fechas": 0.15, "dinero": 0.08, "correos": 0.05}
+
+
+def _fecha(rnd):
+    if rnd.random() < 0.5:
+        return f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2015, 2025)}"
+    return f"{rnd.randint(2015, 2025)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}"
+
+
+def _dinero(rnd):
+    return rnd.choice([
+        f"{rnd.randint(1, 999)}€",
+        f"{rnd.randint(1, 99)}.{rnd.randint(0, 999):03d},{rnd.randint(0, 99):02d} €",
+        f"{rnd.randint(1, 500)} euros",
+        f"${rnd.randint(1, 999)}.{rnd.randint(0, 99):02d}",
+        f"{rnd.randint(1, 999)} USD",
+    ])
+
+
+def _correo(rnd):
+    return f"{rnd.choice(NOMBRES)}.{rnd.randint(1, 999)}@{rnd.choice(DOMINIOS)}"
+
+
+def generar_documento(rnd, frases=4, densidades=DENSIDADES):
+    """Genera un documento de `frases` frases insertando patrones según `densidades`."""
+    partes = [rnd.choice(FRASES) for _ in range(frases)]
+    if rnd.random() < densidades.get("fechas", 0):
+        partes.insert(rnd.randrange(len(partes) + 1), f"Fecha del incidente: {_fecha(rnd)}.")
+    if rnd.random() < densidades.get("dinero", 0):
+        partes.insert(rnd.randrange(len(partes) + 1), f"Importe reclamado: {_dinero(rnd)}.")
+    if rnd.random() < densidades.get("correos", 0):
+        partes.insert(rnd.randrange(len(partes) + 1), f"Contacto: {_correo(rnd)}.")
+    return " ".join(partes)
+
+
+def generar_corpus(n_docs, semilla=42, densidades=DENSIDADES):
+    """Devuelve `n_docs` documentos sintéticos; la misma semilla da siempre el mismo corpus."""
+    rnd = random.Random(semilla)
+    return [generar_documento(rnd, densidades=densidades) for _ in range(n_docs)]
+
+
+def generar_texto(n_caracteres, semilla=42, densidades=DENSIDADES):
+    """Un único texto de `n_caracteres` caracteres: documentos sintéticos separados por saltos de línea."""
+    rnd = random.Random(semilla)
+    partes, total = [], 0
+    while total < n_caracteres:
+        documento = generar_documento(rnd, densidades=densidades)
+        partes.append(documento)
+        total += len(documento) + 1
+    return "\n".join(partes)[:n_caracteres]
+
+
+# ----------------------
+# Utilidades de medida
+# ----------------------
+def _mejor_tiempo(funcion, repeticiones=5):
+    """Mejor tiempo (segundos) de `repeticiones` ejecuciones de `funcion()`."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def _emitir(resultado):
+    sys.stdout.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+
+
+# Funciones medidas en los benchmarks de rendimiento y densidad
+FUNCIONES = {
+    "encontrar_fechas": wordChef.encontrar_fechas,
+    "encontrar_dinero": wordChef.encontrar_dinero,
+    "encontrar_correos": wordChef.encontrar_correos,
+    "encontrar_patrones": wordChef.encontrar_patrones,
+}
+
+# Tamaños del benchmark de rendimiento; el de 100 MB solo con --grande
+TAMANOS = {"1KB": 1 << 10, "1MB": 1 << 20}
+TAMANOS_GRANDES = {"100MB": 100 << 20}
+
+
+# Repeticiones según el tamaño: muchas para textos pequeños (ruido), pocas para los grandes
+def _repeticiones(n_caracteres):
+    return 200 if n_caracteres <= 1 << 12 else 10 if n_caracteres <= 1 << 22 else 2
+
+
+# Mide MB/s (de texto UTF-8) de cada función de FUNCIONES sobre `texto`
+def _medir_funciones(texto, **campos):
+    mb = len(texto.encode("utf-8")) / (1 << 20)
+    resultados = []
+    for nombre, funcion in FUNCIONES.items():
+        n = _repeticiones(len(texto))
+        segundos = _mejor_tiempo(lambda: funcion(texto), repeticiones=n)
+        resultados.append(dict(campos, funcion=nombre, coincidencias=len(funcion(texto)), segundos=segundos,
+                               mb_s=mb / segundos if segundos else None))
+    return resultados
+
+
+# ----------------------
+# Benchmark: rendimiento por tamaño
+# ----------------------
+def bench_rendimiento(grande=False, semilla=42):
+    """
+    Mide el rendimiento (MB/s) de cada función con textos de 1 KB, 1 MB y, con `grande`, 100 MB.
+
+    Returns:
+        list[dict]: Un resultado por tamaño y función.
+    """
+    tamanos = dict(TAMANOS, **TAMANOS_GRANDES) if grande else TAMANOS
+    resultados = []
+    for etiqueta, n in tamanos.items():
+        texto = generar_texto(n, semilla)
+        resultados += _medir_funciones(texto, benchmark="rendimiento", tamano=etiqueta, semilla=semilla)
+    return resultados
+
+
+# ----------------------
+# Benchmark: densidad de coincidencias
+# ----------------------
+# Probabilidades (iguales para los tres patrones) de que un documento contenga cada uno
+DENSIDADES_BARRIDO = (0.0, 0.01, 0.1, 0.5, 1.0)
+
+
+def bench_densidades(tamano=1 << 20, semilla=42, densidades=DENSIDADES_BARRIDO):
+    """
+    Mide cómo cambia el rendimiento con la proporción de documentos que contienen patrones.
+
+    Con densidad 0 los prefiltros descartan casi todo; con densidad 1 todos
+    los documentos pasan por el regex y se construyen todas las coincidencias.
+
+    Returns:
+        list[dict]: Un resultado por densidad y función.
+    """
+    resultados = []
+    for densidad in densidades:
+        texto = generar_texto(tamano, semilla, dict.fromkeys(DENSIDADES, densidad))
+        resultados += _medir_funciones(texto, benchmark="densidades", densidad=densidad, caracteres=tamano, semilla=semilla)
+    return resultados
+
+
+# ----------------------
+# Benchmark: prefiltros
+# ----------------------
+def bench_prefiltros(n_docs=20000, semilla=42):
+    """
+    Mide cuántos documentos descarta cada prefiltro y la ganancia frente al regex sin filtrar.
+
+    Returns:
+        list[dict]: Un resultado por función (`encontrar_fechas`, `encontrar_dinero`,
+        `encontrar_correos` y `encontrar_patrones`).
+    """
+    docs = generar_corpus(n_docs, semilla)
+    sin_filtro = {
+        "encontrar_fechas": (wordChef._RE_FECHAS.findall, wordChef.encontrar_fechas, "fechas"),
+        "encontrar_dinero": (wordChef._RE_DINERO.findall, wordChef.encontrar_dinero, "dinero"),
+        "encontrar_correos": (lambda d: [c.lstrip(wordChef._PREFIJO_CORREO) for c in wordChef._RE_EMAIL.findall(d)],
+                              wordChef.encontrar_correos, "correos"),
+    }
+    resultados = []
+    for nombre, (base, filtrada, tipo) in sin_filtro.items():
+        assert [base(d) for d in docs] == [filtrada(d) for d in docs]
+        descartados = sum(1 for d in docs if not wordChef.PREFILTROS[tipo](d))
+        t_base = _mejor_tiempo(lambda: [base(d) for d in docs])
+        t_filtro = _mejor_tiempo(lambda: [filtrada(d) for d in docs])
+        resultados.append({
+            "benchmark": "prefiltros", "funcion": nombre, "docs": n_docs, "semilla": semilla,
+            "tasa_descarte": descartados / n_docs,
+            "segundos_sin_prefiltro": t_base, "segundos_con_prefiltro": t_filtro,
+            "aceleracion": t_base / t_filtro if t_filtro else None,
+        })
+
+    combinado = wordChef._patron_combinado(tuple(wordChef.PATRONES))
+    descartados = sum(1 for d in docs if not any(f(d) for f in wordChef.PREFILTROS.values()))
+    t_base = _mejor_tiempo(lambda: [list(combinado.finditer(d)) for d in docs])
+    t_filtro = _mejor_tiempo(lambda: [wordChef.encontrar_patrones(d) for d in docs])
+    resultados.append({
+        "benchmark": "prefiltros", "funcion": "encontrar_patrones", "docs": n_docs, "semilla": semilla,
+        "tasa_descarte": descartados / n_docs,
+        "segundos_sin_prefiltro": t_base, "segundos_con_prefiltro": t_filtro,
+        "aceleracion": t_base / t_filtro if t_filtro else None,
+    })
+    return resultados
+
+
+# ----------------------
+# Benchmark: entradas adversariales (ReDoS)
+# ----------------------
+# Familias de entradas diseñadas para provocar backtracking en los patrones
+ADVERSARIALES = {
+    "grupos_miles": lambda n: "1" + ",234" * (n // 4),
+    "digitos_separados": lambda n: "1,2." * (n // 4),
+    "euro_espacios": lambda n: "€ 1" * (n // 3),
+    "usuario_puntos": lambda n: "a." * (n // 2),
+    "dominio_puntos": lambda n: "a@" + "b." * (n // 2) + "1",
+    "arrobas": lambda n: "a@" * (n // 2),
+    "barras": lambda n: "1/" * (n // 2),
+}
+# Alfabeto del fuzz: los caracteres que usan los tres patrones
+ALFABETO_FUZZ = "0123456789.,/-€$@ aZ_%+"
+
+
+def generar_fuzz(n, semilla=42):
+    """Texto aleatorio (determinista) de `n` caracteres sobre `ALFABETO_FUZZ`."""
+    rnd = random.Random(semilla)
+    return "".join(rnd.choice(ALFABETO_FUZZ) for _ in range(n))
+
+
+def bench_adversarial(tam_base=20000, duplicaciones=3, semilla=42):
+    """
+    Comprueba que el coste de los patrones crece linealmente con la entrada.
+
+    Para cada familia de `ADVERSARIALES` (y para texto aleatorio sobre
+    `ALFABETO_FUZZ`) mide el tiempo con tamaños `tam_base * 2**k`. El
+    exponente es la pendiente log-log entre el tamaño menor y el mayor:
+    ~1 es lineal, ~2 sería cuadrático.
+
+    Returns:
+        list[dict]: Un resultado por familia con tiempos, exponente y `lineal`.
+    """
+    # Se mide la alternancia combinada directamente: los prefiltros descartarían
+    # algunas familias (p. ej. dígitos sin moneda) y ocultarían el coste del regex
+    combinado = wordChef._patron_combinado(tuple(wordChef.PATRONES))
+    familias = dict(ADVERSARIALES, fuzz=lambda n: generar_fuzz(n, semilla))
+    resultados = []
+    for nombre, generador in familias.items():
+        tamanos = [tam_base * 2 ** k for k in range(duplicaciones + 1)]
+        tiempos = []
+        for n in tamanos:
+            texto = generador(n)
+            tiempos.append(_mejor_tiempo(lambda: list(combinado.finditer(texto)), repeticiones=3))
+        exponente = math.log2(tiempos[-1] / tiempos[0]) / duplicaciones if tiempos[0] > 0 else 0.0
+        resultados.append({
+            "benchmark": "adversarial", "familia": nombre, "tamanos": tamanos, "segundos": tiempos,
+            "exponente": exponente, "lineal": exponente < 1.5,
+        })
+    return resultados
+
+
+# ----------------------
+# Benchmark: normalizador de una sola pasada
+# ----------------------
+# Implementación anterior de `_normalizar` (varias pasadas), como referencia de resultados y tiempos
+def _normalizar_referencia(texto, doc):
+    palabras = texto.split()
+    sin_repeticiones = " ".join([palabras[i] for i in range(len(palabras)) if i == 0 or palabras[i].lower() != palabras[i-1].lower()])
+    if doc is None:
+        return {"original": texto, "lematizado": "(spaCy requerido)", "sin_repeticiones": sin_repeticiones, "corregido": "(spaCy requerido)"}
+    lematizado = " ".join([t.lemma_ for t in doc])
+    corregido = []
+    for i, token in enumerate(doc):
+        palabra = token.text.lower()
+        if palabra in wordChef.CORRECCIONES_COMUNES:
+            corregido.append(wordChef.CORRECCIONES_COMUNES[palabra])
+            continue
+        if palabra in wordChef.SUSTANTIVOS_NO_NEUTROS:
+            corregido.append(wordChef.SUSTANTIVOS_NO_NEUTROS[palabra])
+            continue
+        if i > 0 and palabra == doc[i-1].text.lower():
+            continue
+        corregido.append(token.text)
+    return {"original": texto, "lematizado": lematizado, "sin_repeticiones": sin_repeticiones, "corregido": " ".join(corregido)}
+
+
+def bench_normalizador(tamano=1 << 20, semilla=42):
+    """
+    Compara `_normalizar` con la implementación anterior sobre `tamano` caracteres de corpus sintético.
+
+    El parseo de spaCy se hace una vez fuera de la medida: solo se mide el
+    recorrido de los Doc. Sin spaCy se mide solo la rama sin Doc
+    (`sin_repeticiones`). Antes de medir se comprueba que ambas versiones
+    devuelven lo mismo.
+
+    Returns:
+        list[dict]: Un resultado con los tiempos de las dos versiones.
+    """
+    textos = generar_texto(tamano, semilla).split("\n")
+    nlp = wordChef.cargar_modelo_spacy()
+    if nlp is not None:
+        docs = list(nlp.pipe(textos, disable=wordChef.componentes_desactivados(nlp, "normalizar")))
+    else:
+        docs = [None] * len(textos)
+    pares = list(zip(textos, docs))
+    # `corregido_difuso` no existía en la versión anterior
+    nuevos = [wordChef._normalizar(t, d) for t, d in pares]
+    assert [{k: v for k, v in r.items() if k != "corregido_difuso"} for r in nuevos] == [_normalizar_referencia(t, d) for t, d in pares]
+    t_referencia = _mejor_tiempo(lambda: [_normalizar_referencia(t, d) for t, d in pares])
+    t_fusionado = _mejor_tiempo(lambda: [wordChef._normalizar(t, d) for t, d in pares])
+    return [{
+        "benchmark": "normalizador", "caracteres": tamano, "semilla": semilla, "spacy": nlp is not None,
+        "tokens": sum(len(d) for d in docs) if nlp is not None else None,
+        "segundos_referencia": t_referencia, "segundos_una_pasada": t_fusionado,
+        "aceleracion": t_referencia / t_fusionado if t_fusionado else None,
+    }]
+
+
+# ----------------------
+# Comparación con una ejecución anterior
+# ----------------------
+# Campos que identifican un resultado entre ejecuciones (todo salvo las medidas)
+_MEDIDAS = {"segundos", "mb_s", "coincidencias", "relativo", "regresion"}
+
+
+def _clave(resultado):
+    return json.dumps({k: v for k, v in resultado.items() if k not in _MEDIDAS}, sort_keys=True)
+
+
+def comparar(resultados, referencia, tolerancia=0.3):
+    """
+    Marca las regresiones de rendimiento frente a una ejecución anterior.
+
+    Args:
+        resultados (list[dict]): Resultados actuales (se modifican).
+        referencia (list[dict]): Resultados de la ejecución anterior.
+        tolerancia (float): Caída relativa de MB/s que se tolera por ruido.
+
+    Returns:
+        list[dict]: Los mismos `resultados`, con `relativo` y `regresion`
+        en los que tienen MB/s y una entrada equivalente en `referencia`.
+    """
+    anteriores = {_clave(r): r for r in referencia if r.get("mb_s")}
+    for resultado in resultados:
+        anterior = anteriores.get(_clave(resultado))
+        if anterior is not None and resultado.get("mb_s"):
+            resultado["relativo"] = resultado["mb_s"] / anterior["mb_s"]
+            resultado["regresion"] = resultado["relativo"] < 1 - tolerancia
+    return resultados
+
+
+# Entorno de la medida, para no comparar resultados de máquinas distintas sin saberlo
+def _entorno():
+    return {"benchmark": "entorno", "python": platform.python_version(),
+            "implementacion": platform.python_implementation(), "maquina": platform.machine(),
+            "sistema": platform.system()}
+
+
+# ----------------------
+# CLI
+# ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks reproducibles de wordChef (salida JSONL).")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    p = sub.add_parser("suite", help="Rendimiento, densidades y entradas adversariales")
+    p.add_argument("--grande", action="store_true", help="Incluir el texto de 100 MB")
+    p.add_argument("--semilla", type=int, default=42)
+    p.add_argument("--referencia", help="JSONL de una ejecución anterior con la que comparar")
+    p.add_argument("--tolerancia", type=float, default=0.3)
+    p = sub.add_parser("rendimiento", help="MB/s con textos de 1 KB, 1 MB y 100 MB")
+    p.add_argument("--grande", action="store_true", help="Incluir el texto de 100 MB")
+    p.add_argument("--semilla", type=int, default=42)
+    p = sub.add_parser("densidades", help="MB/s según la densidad de coincidencias")
+    p.add_argument("--tamano", type=int, default=1 << 20)
+    p.add_argument("--semilla", type=int, default=42)
+    p = sub.add_parser("normalizador", help="Normalizador de una pasada frente a la versión anterior")
+    p.add_argument("--tamano", type=int, default=1 << 20)
+    p.add_argument("--semilla", type=int, default=42)
+    p = sub.add_parser("prefiltros", help="Tasa de descarte y aceleración de los prefiltros")
+    p.add_argument("--docs", type=int, default=20000)
+    p.add_argument("--semilla", type=int, default=42)
+    p = sub.add_parser("adversarial", help="Crecimiento del coste con entradas adversariales y fuzz")
+    p.add_argument("--tam-base", type=int, default=20000)
+    p.add_argument("--duplicaciones", type=int, default=3)
+    p.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "suite":
+        resultados = (bench_rendimiento(args.grande, args.semilla) + bench_densidades(semilla=args.semilla)
+                      + bench_adversarial(semilla=args.semilla))
+        if args.referencia:
+            with open(args.referencia, 'r', encoding='utf-8') as f:
+                comparar(resultados, [json.loads(linea) for linea in f if linea.strip()], args.tolerancia)
+        resultados.insert(0, _entorno())
+    elif args.benchmark == "rendimiento":
+        resultados = bench_rendimiento(args.grande, args.semilla)
+    elif args.benchmark == "densidades":
+        resultados = bench_densidades(args.tamano, args.semilla)
+    elif args.benchmark == "normalizador":
+        resultados = bench_normalizador(args.tamano, args.semilla)
+    elif args.benchmark == "prefiltros":
+        resultados = bench_prefiltros(args.docs, args.semilla)
+    elif args.benchmark == "adversarial":
+        resultados = bench_adversarial(args.tam_base, args.duplicaciones, args.semilla)
+    for resultado in resultados:
+        _emitir(resultado)
+    # Código de salida 1 si algo ha empeorado: útil para lanzar la suite en CI
+    if any(r.get("regresion") or r.get("lineal") is False for r in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,7 @@ import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 from wordChef import (
     normalizador_texto,
-    encontrar_fechas,
-    encontrar_dinero,
-    encontrar_correos,
+    EscanerIncremental,
     resumen_simple,
     extraer_entidades,
     extraer_palabras_clave,
@@ -138,6 +136,8 @@ class WorldChefGUI:
         self.normalizador_output.insert(tk.END, f"Lematizado:\n{res['lematizado']}\n\n")
         self.normalizador_output.insert(tk.END, f"Sin repeticiones:\n{res['sin_repeticiones']}\n\n")
         self.normalizador_output.insert(tk.END, f"Corregido:\n{res['corregido']}\n")
+        if res["corregido_difuso"] is not None:
+            self.normalizador_output.insert(tk.END, f"\nCorrección aproximada:\n{res['corregido_difuso']}\n")
         logger.log("Normalizador", texto, res)
     
     def _setup_patrones(self):
@@ -147,16 +147,40 @@ class WorldChefGUI:
         self.patrones_output = scrolledtext.ScrolledText(self.tab_patrones, wrap=tk.WORD, height=15)
         self.patrones_output.pack(padx=10, pady=5, fill='both')
     
+        # Escáner con caché por bloques: tras una edición solo se reescanean los bloques cambiados
+        self.escaner_patrones = EscanerIncremental()
+        self._patrones_pendiente = None
+        self.texto_input.bind("<<Modified>>", self._texto_modificado)
+    
+    # Con la pestaña de patrones abierta, refresca los resultados poco después de cada edición
+    def _texto_modificado(self, event=None):
+        self.texto_input.edit_modified(False)
+        if self.tabs.select() != str(self.tab_patrones):
+            return
+        if self._patrones_pendiente is not None:
+            self.root.after_cancel(self._patrones_pendiente)
+        self._patrones_pendiente = self.root.after(300, self._refrescar_patrones)
+    
+    # Botón "Buscar Patrones": muestra los resultados y los registra en el log de sesión
     def run_patrones(self):
+        texto, resultado = self._refrescar_patrones()
+        logger.log("Patrones", texto, resultado)
+    
+    # Reescanea y muestra los patrones sin registrar nada: se llama tras cada pausa al escribir
+    def _refrescar_patrones(self):
+        if self._patrones_pendiente is not None:
+            self.root.after_cancel(self._patrones_pendiente)
+        self._patrones_pendiente = None
         texto = self.get_texto()
-        fechas = encontrar_fechas(texto)
-        dinero = encontrar_dinero(texto)
-        correos = encontrar_correos(texto)
+        coincidencias = self.escaner_patrones.escanear(texto)
+        fechas = [c.texto for c in coincidencias if c.tipo == "fechas"]
+        dinero = [c.texto for c in coincidencias if c.tipo == "dinero"]
+        correos = [c.texto for c in coincidencias if c.tipo == "correos"]
         self.patrones_output.delete("1.0", tk.END)
         self.patrones_output.insert(tk.END, f"Fechas: {fechas or 'Ninguna'}\n")
         self.patrones_output.insert(tk.END, f"Dinero: {dinero or 'Ninguno'}\n")
         self.patrones_output.insert(tk.END, f"Correos: {correos or 'Ninguno'}\n")
-        logger.log("Patrones", texto, {"Fechas": fechas, "Dinero": dinero, "Correos": correos})
+        return texto, {"Fechas": fechas, "Dinero": dinero, "Correos": correos}
     
     def _setup_resumen(self):
         btn = tk.Button(self.tab_resumen, text="Generar Resumen", command=self.run_resumen,
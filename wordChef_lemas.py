@@ -0,0 +1,228 @@
+"""
+Tabla de lemas precompilada para lematizar sin spaCy.
+
+La tabla se compila una vez a partir de un TSV ("forma<TAB>lema") a un
+archivo binario ordenado que se abre con `mmap`: abrirla cuesta unos
+milisegundos, el sistema operativo solo carga en memoria las páginas que
+se consultan y varios procesos comparten las mismas páginas.
+
+Formato (enteros de 32 bits little-endian):
+    cabecera   "WCLEMAS1", n_formas, n_lemas
+    formas     n_formas + 1 offsets al bloque de formas
+    lema_de    n_formas índices de lema
+    lemas      n_lemas + 1 offsets al bloque de lemas
+    bloques    formas (UTF-8, en minúsculas, ordenadas por bytes) y lemas (UTF-8, sin repetir)
+
+Uso:
+    python wordChef_lemas.py compilar lemas_ejemplo.tsv lemas.bin
+    python wordChef_lemas.py buscar lemas.bin procesamos casas
+"""
+
+import sys
+import mmap
+import struct
+import argparse
+from array import array
+
+
+MAGIA = b"WCLEMAS1"
+_CABECERA = struct.Struct("<8sII")
+
+
+# ----------------------
+# Compilación
+# ----------------------
+# Bytes de un array de enteros de 32 bits en little-endian
+def _bytes_le(enteros):
+    datos = array("I", enteros)
+    if sys.byteorder == "big":
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def compilar_tabla(entradas, ruta_salida):
+    """
+    Escribe la tabla binaria a partir de pares (forma, lema).
+
+    Las formas se guardan en minúsculas; si una forma se repite, gana el
+    último lema. Cada lema distinto se guarda una sola vez.
+
+    Args:
+        entradas (Iterable[tuple[str, str]]): Pares (forma, lema).
+        ruta_salida (str): Archivo binario a crear.
+
+    Returns:
+        int: Número de formas de la tabla.
+    """
+    lema_de = {}
+    for forma, lema in entradas:
+        lema_de[forma.lower().encode("utf-8")] = lema
+    formas = sorted(lema_de)
+    lemas = sorted(set(lema_de.values()))
+    indice_lema = {lema: i for i, lema in enumerate(lemas)}
+    lemas_utf8 = [lema.encode("utf-8") for lema in lemas]
+
+    def offsets(bloques):
+        total, resultado = 0, [0]
+        for bloque in bloques:
+            total += len(bloque)
+            resultado.append(total)
+        return resultado
+
+    with open(ruta_salida, "wb") as f:
+        f.write(_CABECERA.pack(MAGIA, len(formas), len(lemas)))
+        f.write(_bytes_le(offsets(formas)))
+        f.write(_bytes_le(indice_lema[lema_de[forma]] for forma in formas))
+        f.write(_bytes_le(offsets(lemas_utf8)))
+        f.write(b"".join(formas))
+        f.write(b"".join(lemas_utf8))
+    return len(formas)
+
+
+def compilar_tsv(ruta_tsv, ruta_salida):
+    """
+    Compila un TSV "forma<TAB>lema" (líneas vacías y '#' se ignoran).
+
+    Returns:
+        int: Número de formas de la tabla.
+
+    Raises:
+        ValueError: Si una línea no tiene tabulador.
+    """
+    def entradas():
+        with open(ruta_tsv, "r", encoding="utf-8") as f:
+            for n, linea in enumerate(f, 1):
+                linea = linea.rstrip("\r\n")
+                if not linea.strip() or linea.startswith("#"):
+                    continue
+                forma, separador, lema = linea.partition("\t")
+                if not separador:
+                    raise ValueError(f"{ruta_tsv}:{n}: se esperaba 'forma<TAB>lema'")
+                yield forma.strip(), lema.strip()
+    return compilar_tabla(entradas(), ruta_salida)
+
+
+# ----------------------
+# Consulta
+# ----------------------
+class TablaLemas:
+    """
+    Tabla de lemas abierta con `mmap` y consultada por búsqueda binaria.
+
+    Atributos:
+    - ruta (str): Archivo binario de la tabla.
+    """
+    # Tamaño máximo de la caché de formas ya consultadas
+    MAX_CACHE = 1 << 16
+
+    # Constructor: abre el archivo y lee la cabecera; no carga la tabla en memoria
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magia, self._n_formas, self._n_lemas = _CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA:
+            self._mm.close()
+            raise ValueError(f"{ruta} no es una tabla de lemas de wordChef")
+        self._vistas = []
+        posicion = _CABECERA.size
+        self._off_formas = self._enteros(posicion, self._n_formas + 1)
+        posicion += 4 * (self._n_formas + 1)
+        self._lema_de = self._enteros(posicion, self._n_formas)
+        posicion += 4 * self._n_formas
+        self._off_lemas = self._enteros(posicion, self._n_lemas + 1)
+        posicion += 4 * (self._n_lemas + 1)
+        self._base_formas = posicion
+        self._base_lemas = posicion + self._off_formas[-1]
+        self._cache = {}
+
+    # Vista de `n` enteros de 32 bits; sin copia en máquinas little-endian
+    def _enteros(self, posicion, n):
+        if sys.byteorder == "big":
+            datos = array("I", self._mm[posicion:posicion + 4 * n])
+            datos.byteswap()
+            return datos
+        base = memoryview(self._mm)
+        tramo = base[posicion:posicion + 4 * n]
+        vista = tramo.cast("I")
+        # Las vistas se liberan en `cerrar`: mmap no se puede cerrar mientras existan
+        self._vistas += [vista, tramo, base]
+        return vista
+
+    def __len__(self):
+        return self._n_formas
+
+    # Lema de una forma (en minúsculas) o None si no está en la tabla
+    def buscar(self, forma):
+        """
+        Args:
+            forma (str): Palabra a lematizar (se compara en minúsculas).
+
+        Returns:
+            str | None: Lema de la tabla, o `None` si la forma no está.
+        """
+        if forma in self._cache:
+            return self._cache[forma]
+        clave = forma.lower().encode("utf-8")
+        mm, base, offsets = self._mm, self._base_formas, self._off_formas
+        bajo, alto = 0, self._n_formas
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if mm[base + offsets[medio]:base + offsets[medio + 1]] < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        lema = None
+        if bajo < self._n_formas and mm[base + offsets[bajo]:base + offsets[bajo + 1]] == clave:
+            i = self._lema_de[bajo]
+            lema = mm[self._base_lemas + self._off_lemas[i]:self._base_lemas + self._off_lemas[i + 1]].decode("utf-8")
+        if len(self._cache) >= self.MAX_CACHE:
+            self._cache.clear()
+        self._cache[forma] = lema
+        return lema
+
+    # Lema de una forma; las que no están en la tabla se devuelven en minúsculas
+    def lema(self, forma):
+        lema = self.buscar(forma)
+        return lema if lema is not None else forma.lower()
+
+    # Libera el mmap
+    def cerrar(self):
+        self._off_formas = self._lema_de = self._off_lemas = None
+        for vista in self._vistas:
+            vista.release()
+        self._vistas = []
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# ----------------------
+# CLI
+# ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compila y consulta tablas de lemas de wordChef.")
+    sub = parser.add_subparsers(dest="orden", required=True)
+    p = sub.add_parser("compilar", help="Compila un TSV 'forma<TAB>lema' a tabla binaria")
+    p.add_argument("tsv")
+    p.add_argument("salida")
+    p = sub.add_parser("buscar", help="Busca el lema de una o varias formas")
+    p.add_argument("tabla")
+    p.add_argument("formas", nargs="+")
+    args = parser.parse_args(argv)
+
+    if args.orden == "compilar":
+        n = compilar_tsv(args.tsv, args.salida)
+        print(f"{n} formas escritas en {args.salida}")
+    else:
+        with TablaLemas(args.tabla) as tabla:
+            for forma in args.formas:
+                print(f"{forma}\t{tabla.lema(forma)}")
+
+
+if __name__ == "__main__":
+    main()
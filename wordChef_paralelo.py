@@ -0,0 +1,307 @@
+"""
+Ejecución multiproceso de los analizadores de wordChef sobre un corpus.
+
+Cada proceso trabajador carga una sola vez, al arrancar, el modelo de
+spaCy (`cargar_modelo_spacy`) y el clasificador de sentimiento
+(`inicializar_sentimiento`) que necesite la tarea, y después procesa
+fragmentos del corpus con las variantes por lotes de `wordChef`.
+
+Uso desde la línea de comandos (un documento por línea, salida JSONL):
+    python wordChef_paralelo.py corpus.txt --tarea entidades -j 32
+
+Con un directorio en lugar de un archivo se recorren todos sus .txt
+buscando fechas, dinero y correos (una línea por archivo y, al final,
+una línea con los agregados):
+    python wordChef_paralelo.py carpeta/ -j 32
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+
+import wordChef
+
+
+# ----------------------
+# Estado de cada proceso trabajador
+# ----------------------
+# Modelos cargados una vez por proceso en `_inicializar_trabajador`
+_nlp = None
+_clasificador = None
+# Tiempo máximo de búsqueda de patrones por documento o archivo (None: sin límite)
+_limite_patrones = None
+
+# Tareas disponibles: reciben un fragmento de textos y el tamaño de lote de spaCy
+_TAREAS = {
+    "normalizar": lambda textos, bs: wordChef.normalizador_texto_lote(textos, _nlp, bs),
+    "patrones": lambda textos, bs: (wordChef._buscar_patrones(t or "", _limite_patrones) for t in textos),
+    "resumen": lambda textos, bs: wordChef.resumen_simple_lote(textos, nlp=_nlp, batch_size=bs),
+    "entidades": lambda textos, bs: wordChef.extraer_entidades_lote(textos, _nlp, bs),
+    "palabras_clave": lambda textos, bs: wordChef.extraer_palabras_clave_lote(textos, _nlp, bs),
+    "sentimiento": lambda textos, bs: wordChef.sentimiento_es_lote(textos, _clasificador),
+    "todo": lambda textos, bs: wordChef.analizar_todo_lote(textos, _nlp, _clasificador, batch_size=bs,
+                                                           limite_patrones=_limite_patrones),
+    # Aquí cada "texto" es la ruta de un archivo
+    "patrones_archivo": lambda rutas, bs: (_patrones_de_archivo(r) for r in rutas),
+}
+TAREAS = tuple(_TAREAS)
+
+# Qué recursos necesita cada tarea
+_TAREAS_SPACY = {"normalizar", "resumen", "entidades", "palabras_clave", "todo"}
+_TAREAS_SENTIMIENTO = {"sentimiento", "todo"}
+_TAREAS_NLTK = {"palabras_clave", "todo"}
+
+
+# Carga los modelos que necesita la tarea; se ejecuta una vez al arrancar cada proceso
+def _inicializar_trabajador(tarea, limite_patrones=None):
+    global _nlp, _clasificador, _limite_patrones
+    _limite_patrones = limite_patrones
+    if tarea in _TAREAS_SPACY:
+        _nlp = wordChef.cargar_modelo_spacy()
+    if tarea in _TAREAS_SENTIMIENTO:
+        _clasificador = wordChef.inicializar_sentimiento()
+    if tarea in _TAREAS_NLTK:
+        wordChef.inicializar_nltk()
+
+
+# Procesa un fragmento del corpus dentro del trabajador
+def _procesar_fragmento(tarea, inicio, textos, batch_size):
+    return inicio, list(_TAREAS[tarea](textos, batch_size))
+
+
+# Divide el corpus en fragmentos (inicio, lista de textos) sin materializarlo entero
+def _fragmentos(textos, tam_fragmento):
+    iterador = iter(textos)
+    inicio = 0
+    while True:
+        fragmento = list(islice(iterador, tam_fragmento))
+        if not fragmento:
+            return
+        yield inicio, fragmento
+        inicio += len(fragmento)
+
+
+# ----------------------
+# Runner de corpus
+# ----------------------
+def procesar_corpus(textos, tarea="todo", n_process=None, tam_fragmento=256,
+                    batch_size=wordChef.TAM_LOTE, ordenado=True, limite_patrones=None):
+    """
+    Aplica un analizador de wordChef a un corpus usando varios procesos.
+
+    El corpus se consume de forma perezosa y se reparte en fragmentos de
+    `tam_fragmento` textos. Como mucho hay `2 * n_process` fragmentos en
+    vuelo, así que la memoria no crece con el tamaño del corpus.
+
+    Args:
+        textos (Iterable[str]): Documentos a procesar.
+        tarea (str): Una de `TAREAS` ('normalizar', 'patrones', 'resumen',
+            'entidades', 'palabras_clave', 'sentimiento', 'todo').
+        n_process (int | None): Procesos trabajadores; `None` usa todos los
+            núcleos y `1` procesa en el propio proceso, sin pool.
+        tam_fragmento (int): Documentos por fragmento enviado a un trabajador.
+        batch_size (int): Tamaño de lote de `nlp.pipe` dentro de cada trabajador.
+        ordenado (bool): Si es `True` los resultados salen en el orden de
+            entrada; si es `False` salen según terminan los fragmentos.
+        limite_patrones (float | None): Segundos máximos de búsqueda de patrones
+            por documento (tareas 'patrones' y 'todo') o por archivo
+            ('patrones_archivo'). Un documento que lo supera sale con 'error'
+            en lugar de bloquear al trabajador.
+
+    Yields:
+        tuple: (indice, resultado), donde `indice` es la posición del
+        documento en el corpus y `resultado` lo que devuelve el analizador.
+    """
+    if tarea not in _TAREAS:
+        raise ValueError(f"Tarea desconocida: {tarea!r}. Opciones: {', '.join(TAREAS)}")
+    n_process = n_process or os.cpu_count() or 1
+
+    if n_process == 1:
+        _inicializar_trabajador(tarea, limite_patrones)
+        for inicio, fragmento in _fragmentos(textos, tam_fragmento):
+            for i, resultado in enumerate(_procesar_fragmento(tarea, inicio, fragmento, batch_size)[1]):
+                yield inicio + i, resultado
+        return
+
+    fragmentos = _fragmentos(textos, tam_fragmento)
+    max_pendientes = 2 * n_process
+    with ProcessPoolExecutor(max_workers=n_process, initializer=_inicializar_trabajador,
+                             initargs=(tarea, limite_patrones)) as pool:
+        # Envía fragmentos hasta llenar la ventana de pendientes
+        def enviar(pendientes):
+            for inicio, fragmento in islice(fragmentos, max_pendientes - len(pendientes)):
+                pendientes.append(pool.submit(_procesar_fragmento, tarea, inicio, fragmento, batch_size))
+
+        if ordenado:
+            pendientes = deque()
+            enviar(pendientes)
+            while pendientes:
+                inicio, resultados = pendientes.popleft().result()
+                enviar(pendientes)
+                for i, resultado in enumerate(resultados):
+                    yield inicio + i, resultado
+        else:
+            pendientes = []
+            enviar(pendientes)
+            while pendientes:
+                hechos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                pendientes = [f for f in pendientes if f not in hechos]
+                enviar(pendientes)
+                for futuro in hechos:
+                    inicio, resultados = futuro.result()
+                    for i, resultado in enumerate(resultados):
+                        yield inicio + i, resultado
+
+
+# ----------------------
+# Barrido de directorios
+# ----------------------
+# Busca los patrones incluidos en un archivo, leyéndolo por bloques
+def _patrones_de_archivo(ruta):
+    resultado = {"archivo": ruta}
+    resultado.update({tipo: [] for tipo in wordChef.TIPOS_INCLUIDOS})
+    try:
+        for coincidencia in wordChef.encontrar_patrones_archivo(ruta, wordChef.TIPOS_INCLUIDOS,
+                                                                limite_segundos=_limite_patrones):
+            resultado[coincidencia.tipo].append(coincidencia.texto)
+    except (OSError, TimeoutError) as e:
+        # Con TimeoutError se conservan las coincidencias encontradas hasta el corte
+        resultado["error"] = str(e)
+    return resultado
+
+
+# Rutas de los archivos con alguna de las extensiones, en orden estable
+def _archivos(raiz, extensiones):
+    for carpeta, subcarpetas, nombres in os.walk(raiz):
+        subcarpetas.sort()
+        for nombre in sorted(nombres):
+            if nombre.lower().endswith(extensiones):
+                yield os.path.join(carpeta, nombre)
+
+
+class AgregadosPatrones:
+    """
+    Resumen global de un barrido: se alimenta con los resultados por archivo.
+
+    Atributos:
+    - archivos (int): archivos procesados.
+    - errores (int): archivos que no se pudieron leer.
+    - coincidencias (Counter): número de coincidencias por tipo.
+    - correos (set): correos distintos, en minúsculas.
+    - totales (dict): suma de importes (Decimal) por moneda.
+    - histograma_fechas (Counter): fechas por mes ('AAAA-MM').
+    - no_interpretados (Counter): cantidades y fechas que no se pudieron interpretar.
+    """
+
+    def __init__(self):
+        self.archivos = 0
+        self.errores = 0
+        self.coincidencias = Counter()
+        self.correos = set()
+        self.totales = {}
+        self.histograma_fechas = Counter()
+        self.no_interpretados = Counter()
+
+    # Acumula el resultado de un archivo
+    def agregar(self, resultado):
+        self.archivos += 1
+        if "error" in resultado:
+            self.errores += 1
+        for tipo in wordChef.TIPOS_INCLUIDOS:
+            self.coincidencias[tipo] += len(resultado.get(tipo, ()))
+        self.correos.update(correo.lower() for correo in resultado.get("correos", ()))
+        for cantidad in resultado.get("dinero", ()):
+            interpretada = wordChef.parsear_dinero(cantidad)
+            if interpretada is None:
+                self.no_interpretados["dinero"] += 1
+                continue
+            importe, moneda = interpretada
+            self.totales[moneda] = self.totales.get(moneda, 0) + importe
+        for fecha in resultado.get("fechas", ()):
+            iso = wordChef.parsear_fecha(fecha)
+            if iso is None:
+                self.no_interpretados["fechas"] += 1
+            else:
+                self.histograma_fechas[iso[:7]] += 1
+
+    # Versión serializable en JSON (los importes van como texto para no perder precisión)
+    def como_dict(self):
+        return {
+            "archivos": self.archivos,
+            "errores": self.errores,
+            "coincidencias": dict(self.coincidencias),
+            "correos_unicos": len(self.correos),
+            "correos": sorted(self.correos),
+            "totales": {moneda: str(total) for moneda, total in sorted(self.totales.items())},
+            "histograma_fechas": dict(sorted(self.histograma_fechas.items())),
+            "no_interpretados": dict(self.no_interpretados),
+        }
+
+
+def barrer_directorio(raiz, n_process=None, extensiones=(".txt",), tam_fragmento=8, agregados=None,
+                      limite_segundos=None):
+    """
+    Busca fechas, dinero y correos en todos los archivos de un árbol de directorios.
+
+    Cada archivo se lee en streaming (`encontrar_patrones_archivo`), así que
+    un archivo enorme no se carga entero en memoria. Los archivos se reparten
+    entre procesos con `procesar_corpus` y los resultados salen según terminan.
+
+    Args:
+        raiz (str): Directorio a recorrer (recursivamente).
+        n_process (int | None): Procesos trabajadores; `None` usa todos los núcleos.
+        extensiones (tuple[str]): Extensiones de archivo a incluir.
+        tam_fragmento (int): Archivos por tarea enviada a un trabajador.
+        agregados (AgregadosPatrones | None): Si se pasa, se acumula en él cada resultado.
+        limite_segundos (float | None): Tiempo máximo de búsqueda por archivo.
+
+    Yields:
+        dict: {'archivo': ruta, 'fechas': [...], 'dinero': [...], 'correos': [...]}
+        y 'error' si el archivo no se pudo leer o superó `limite_segundos`.
+    """
+    rutas = _archivos(raiz, tuple(e.lower() for e in extensiones))
+    for _, resultado in procesar_corpus(rutas, "patrones_archivo", n_process, tam_fragmento, ordenado=False,
+                                        limite_patrones=limite_segundos):
+        if agregados is not None:
+            agregados.agregar(resultado)
+        yield resultado
+
+
+# ----------------------
+# CLI
+# ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procesa un corpus (un documento por línea) en paralelo.")
+    parser.add_argument("corpus", help="Archivo de texto con un documento por línea, o directorio a barrer")
+    parser.add_argument("--tarea", choices=TAREAS, default="todo")
+    parser.add_argument("-j", "--n-process", type=int, default=None, help="Procesos (por defecto, todos los núcleos)")
+    parser.add_argument("--tam-fragmento", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=wordChef.TAM_LOTE)
+    parser.add_argument("--desordenado", action="store_true", help="Emitir resultados según terminan")
+    parser.add_argument("--extension", action="append", help="Extensión a incluir al barrer un directorio (por defecto .txt)")
+    parser.add_argument("--limite-segundos", type=float, default=None,
+                        help="Tiempo máximo de búsqueda de patrones por documento o archivo")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.corpus):
+        agregados = AgregadosPatrones()
+        for resultado in barrer_directorio(args.corpus, args.n_process, tuple(args.extension or (".txt",)),
+                                           agregados=agregados, limite_segundos=args.limite_segundos):
+            sys.stdout.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        sys.stdout.write(json.dumps({"agregados": agregados.como_dict()}, ensure_ascii=False) + "\n")
+        return
+
+    with open(args.corpus, 'r', encoding='utf-8') as f:
+        textos = (linea.rstrip("\n") for linea in f)
+        for indice, resultado in procesar_corpus(textos, args.tarea, args.n_process, args.tam_fragmento,
+                                                 args.batch_size, ordenado=not args.desordenado,
+                                                 limite_patrones=args.limite_segundos):
+            sys.stdout.write(json.dumps({"indice": indice, "resultado": resultado}, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()